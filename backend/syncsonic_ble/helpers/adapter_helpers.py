@@ -19,36 +19,51 @@ Environment variables
 ---------------------
 RESERVED_HCI
     Name of the controller (e.g. ``hci1``) that must remain reserved for phone
-    advertisement.  The application raises :class:`RuntimeError` at import-time
-    if the variable is missing because we always need to know which controller
-    is used for advertising.
+    advertisement.  The application raises :class:`RuntimeError` on first use
+    (see :func:`~syncsonic_ble.utils.constants.require_reserved_hci`) if the
+    variable is missing because we always need to know which controller is
+    used for advertising.
 """
 from __future__ import annotations
-import dbus, os, time
+import dbus, sys, time
+from functools import lru_cache
 from gi.repository import GLib
 from syncsonic_ble.utils.constants import (
     BLUEZ_SERVICE_NAME,
     ADAPTER_INTERFACE,
     DBUS_OM_IFACE,
+    BLUEZ_OM_PATH,
     DBUS_PROP_IFACE,
     LE_ADVERTISING_MANAGER_IFACE,
     DEVICE_INTERFACE,
+    require_reserved_hci,
 )
 from syncsonic_ble.utils.logging_conf import get_logger
+from syncsonic_ble.state_management.bus_manager import get_managed_objects_fast
 
 log = get_logger(__name__)
 
-# Check if the RESERVED_HCI environment variable is set, which is required to identify the phone adapter.
-RESERVED_HCI = os.getenv("RESERVED_HCI")
-if not RESERVED_HCI:
-    raise RuntimeError("RESERVED_HCI environment variable not set – cannot pick phone adapter")
-
 # Lazy-loaded SystemBus instance; set by syncsonic_ble.main
 _BUS = None
+# ObjectManager proxy on _BUS, built once in set_bus() and reused by every call
+_OM: dbus.Interface | None = None
+
+# Controller MAC -> /org/bluez/hciX.  Only changes on adapter hot-plug, see
+# forget_adapter_paths().
+_ADAPTER_PATHS: dict[str, str] = {}
+# (ctrl_mac, dev_mac) as passed by callers -> device path; derived from
+# _ADAPTER_PATHS and cleared together with it.
+_DEVICE_PATHS: dict[tuple[str, str], str] = {}
+_DEVICE_PATHS_MAX = 256
+
+# Translation tables for BlueZ path segment <-> MAC conversion (single pass)
+_U2C = str.maketrans("_", ":")
+_C2U = str.maketrans(":", "_")
 
 def set_bus(bus):
-    global _BUS
+    global _BUS, _OM
     _BUS = bus
+    _OM = dbus.Interface(bus.get_object(BLUEZ_SERVICE_NAME, BLUEZ_OM_PATH), DBUS_OM_IFACE)
 
 def find_adapter(preferred: str | None = None):
     """
@@ -58,8 +73,7 @@ def find_adapter(preferred: str | None = None):
     Returns:
         Tuple of (adapter_path, adapter_interface) or (None, None) if no adapter is found.
     """
-    om = dbus.Interface(_BUS.get_object(BLUEZ_SERVICE_NAME, "/"), DBUS_OM_IFACE)
-    for path, ifaces in om.GetManagedObjects().items():
+    for path, ifaces in get_managed_objects(_BUS).items():
         if ADAPTER_INTERFACE not in ifaces:
             continue
         if preferred and path.split("/")[-1] != preferred:
@@ -95,9 +109,7 @@ def get_reserved_advertising_manager(bus):
     Returns:
         Tuple of (adapter_path, LEAdvertisingManager1).
     """
-    hci = os.getenv("RESERVED_HCI")
-    if not hci:
-        raise RuntimeError("RESERVED_HCI not set – cannot pick phone adapter")
+    hci = require_reserved_hci()
 
     adapter_path = f"/org/bluez/{hci}"
     obj = bus.get_object(BLUEZ_SERVICE_NAME, adapter_path)
@@ -105,6 +117,28 @@ def get_reserved_advertising_manager(bus):
     log.info("Advertising manager acquired on %s", adapter_path)
     return adapter_path, ad_mgr
 
+@lru_cache(maxsize=256)
+def normalize_path(path: str) -> tuple[str, str, str] | None:
+    """
+    Split a BlueZ device path (or any object below it) in one pass.
+    Example: /org/bluez/hci0/dev_AA_BB_CC_DD_EE_FF →
+    ("AA:BB:CC:DD:EE:FF", "AA_BB_CC_DD_EE_FF", "/org/bluez/hci0")
+    Args:
+        path: The BlueZ object path.
+    Returns:
+        ``(mac, underscore_mac, adapter_prefix)`` or None for non-device paths.
+        Object paths never change meaning, so results are cached.
+    """
+    parts = path.split("/", 5)
+    if len(parts) < 5 or not parts[4].startswith("dev_"):
+        return None
+    underscore = parts[4][4:].upper()
+    return underscore.translate(_U2C), underscore, sys.intern("/".join(parts[:4]))
+
+def mac_to_path_segment(mac: str) -> str:
+    """Return *mac* in BlueZ path form: ``AA:BB:…`` → ``AA_BB_…``."""
+    return mac.translate(_C2U)
+
 def extract_mac(path: str) -> str | None:
     """
     Return the Bluetooth MAC (AA:BB:CC:DD:EE:FF) from a BlueZ device path.
@@ -114,9 +148,8 @@ def extract_mac(path: str) -> str | None:
     Returns:
         The MAC address as a string, or None if not found.
     """
-    if "dev_" not in path:
-        return None
-    return path.split("/")[-1].replace("dev_", "").replace("_", ":").upper()
+    norm = normalize_path(str(path))
+    return norm[0] if norm else None
 
 def adapter_prefix_from_path(device_path: str) -> str:
     """
@@ -126,7 +159,8 @@ def adapter_prefix_from_path(device_path: str) -> str:
     Returns:
         The adapter prefix as a string.
     """
-    return "/".join(device_path.split("/")[:4])
+    norm = normalize_path(str(device_path))
+    return norm[2] if norm else "/".join(device_path.split("/")[:4])
 
 def connected_devices_on_adapter(bus, adapter_prefix: str) -> list[str]:
     """
@@ -137,7 +171,7 @@ def connected_devices_on_adapter(bus, adapter_prefix: str) -> list[str]:
     Returns:
         A list of MAC addresses of connected devices.
     """
-    objs = _get_managed_objects(bus)
+    objs = get_managed_objects(bus)
 
     result: list[str] = []
     for obj_path, ifaces in objs.items():
@@ -158,18 +192,32 @@ def device_path_on_adapter(bus, ctrl_mac: str, dev_mac: str) -> str | None:
     Returns:
         The device path as a string, or None if not found.
     """
+    key = (ctrl_mac, dev_mac)
+    device_path = _DEVICE_PATHS.get(key)
+    if device_path is not None:
+        return device_path
+
     ctrl_mac = ctrl_mac.upper()
-    dev_mac_fmt = dev_mac.upper().replace(":", "_")
+    adapter_path = _ADAPTER_PATHS.get(ctrl_mac)
+    if adapter_path is None:
+        for path, ifaces in get_managed_objects(bus).items():
+            adapter = ifaces.get(ADAPTER_INTERFACE)
+            if adapter and adapter.get("Address"):
+                _ADAPTER_PATHS.setdefault(str(adapter["Address"]).upper(), str(path))
+        adapter_path = _ADAPTER_PATHS.get(ctrl_mac)
+        if adapter_path is None:
+            return None
 
-    objects = _get_managed_objects(bus)
+    device_path = f"{adapter_path}/dev_{mac_to_path_segment(dev_mac.upper())}"
+    if len(_DEVICE_PATHS) >= _DEVICE_PATHS_MAX:
+        _DEVICE_PATHS.clear()
+    _DEVICE_PATHS[key] = device_path
+    return device_path
 
-    for path, ifaces in objects.items():
-        adapter = ifaces.get(ADAPTER_INTERFACE)
-        if not adapter:
-            continue
-        if adapter.get("Address", "").upper() == ctrl_mac:
-            return f"{path}/dev_{dev_mac_fmt}"
-    return None
+def forget_adapter_paths() -> None:
+    """Drop the controller MAC → adapter path cache (call on adapter add/remove)."""
+    _ADAPTER_PATHS.clear()
+    _DEVICE_PATHS.clear()
 
 def adapter_proxies(bus) -> dict[str, object]:
     """
@@ -179,7 +227,7 @@ def adapter_proxies(bus) -> dict[str, object]:
     Returns:
         A dictionary mapping MAC addresses to adapter proxies.
     """
-    objects = _get_managed_objects(bus)
+    objects = get_managed_objects(bus)
     proxies: dict[str, object] = {}
     for path, ifaces in objects.items():
         adapter = ifaces.get(ADAPTER_INTERFACE)
@@ -191,13 +239,19 @@ def adapter_proxies(bus) -> dict[str, object]:
         proxies[mac] = dbus.Interface(bus.get_object(BLUEZ_SERVICE_NAME, path), ADAPTER_INTERFACE)
     return proxies
 
-def _get_managed_objects(bus):
+def get_managed_objects(bus):
     """
     Return the BlueZ object tree via ObjectManager.GetManagedObjects().
+    Uses the dbus-fast backend when installed, dbus-python otherwise.
     Args:
         bus: The D-Bus system bus instance.
     Returns:
         The managed objects as a dictionary.
     """
-    om = dbus.Interface(bus.get_object(BLUEZ_SERVICE_NAME, "/"), DBUS_OM_IFACE)
+    objects = get_managed_objects_fast()
+    if objects is not None:
+        return objects
+    om = _OM
+    if om is None or bus is not _BUS:
+        om = dbus.Interface(bus.get_object(BLUEZ_SERVICE_NAME, BLUEZ_OM_PATH), DBUS_OM_IFACE)
     return om.GetManagedObjects()
\ No newline at end of file
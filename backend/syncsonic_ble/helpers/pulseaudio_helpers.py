@@ -1,22 +1,222 @@
 # utils/pulseaudio.py
+import os
+import re
+import socket
 import subprocess
+import threading
 import time
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from gi.repository import GLib
 
 # First-party logging -------------------------------------------------------
 from syncsonic_ble.utils.logging_conf import get_logger
 
 log = get_logger(__name__)
 
+# `sink=<name>` argument inside a `pactl list short modules` line
+_SINK_ARG_RE = re.compile(r"(?:^|\s)sink=(\S+)")
+
+# Sink-name cache.  Only trusted while a `pactl subscribe` watcher is alive to
+# invalidate it on sink new/remove events; _SINKS_GEN guards against storing a
+# listing that raced with an invalidation.
+_SINKS_LOCK = threading.Lock()
+_SINKS: Optional[List[str]] = None
+_SINKS_GEN = 0
+_SINK_WATCHER: Optional[threading.Thread] = None
+
 # --------------------------------------------------------------------------
 #  Public helpers
 # --------------------------------------------------------------------------
 
-def remove_loopback_for_device(mac: str):
-    """Unload every loopback that targets the *sink* of the given BT MAC."""
-    sink_name = f"bluez_sink.{mac.replace(':', '_')}.a2dp_sink"
+@lru_cache(maxsize=64)
+def bluez_sink_prefix(mac: str) -> str:
+    """Return ``bluez_sink.AA_BB_…`` – the prefix of every sink for *mac*."""
+    return f"bluez_sink.{mac.replace(':', '_')}"
+
+@lru_cache(maxsize=64)
+def a2dp_sink_name(mac: str) -> str:
+    """Return the A2DP sink name PulseAudio creates for the BT device *mac*."""
+    return f"{bluez_sink_prefix(mac)}.a2dp_sink"
+
+def list_sinks(fresh: bool = False) -> Optional[List[str]]:
+    """Return all PulseAudio sink names, or None if pactl failed.
+
+    Served from cache while the ``pactl subscribe`` watcher is running, so
+    repeated lookups cost no fork/exec until a sink appears or disappears.
+    Pass *fresh* to bypass the cache.
+    """
+    _ensure_sink_watcher()
+    with _SINKS_LOCK:
+        if _SINKS is not None and not fresh:
+            return _SINKS
+        gen = _SINKS_GEN
+
+    result = subprocess.run(["pactl", "list", "sinks", "short"], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    sinks = [parts[1] for parts in (l.split() for l in result.stdout.splitlines()) if len(parts) >= 2]
+
+    _store_sinks(sinks, gen)
+    return sinks
+
+def find_sink(prefix: str) -> Optional[str]:
+    """Return the first sink whose name starts with *prefix*, if any.
+
+    Only hits are served from cache: a snapshot taken before the watcher
+    had subscribed may miss a sink that just appeared, so a miss is always
+    re-checked against a fresh listing.
+    """
+    with _SINKS_LOCK:
+        cached = _SINKS
+    for name in cached or ():
+        if name.startswith(prefix):
+            return name
+    return next((name for name in list_sinks(fresh=True) or () if name.startswith(prefix)), None)
+
+def _store_sinks(sinks: List[str], gen: int) -> None:
+    global _SINKS
+    with _SINKS_LOCK:
+        if gen == _SINKS_GEN and _SINK_WATCHER is not None:
+            _SINKS = sinks
+
+def _invalidate_sinks() -> None:
+    global _SINKS, _SINKS_GEN
+    with _SINKS_LOCK:
+        _SINKS = None
+        _SINKS_GEN += 1
+
+def _ensure_sink_watcher() -> None:
+    """Start the `pactl subscribe` watcher thread unless it is already running."""
+    global _SINK_WATCHER
+    with _SINKS_LOCK:
+        if _SINK_WATCHER is not None:
+            return
+        _SINK_WATCHER = threading.Thread(target=_watch_sinks, name="pa-sink-watch", daemon=True)
+        _SINK_WATCHER.start()
+
+def _watch_sinks() -> None:
+    global _SINK_WATCHER
+    try:
+        proc = subprocess.Popen(["pactl", "subscribe"], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
+        for line in proc.stdout:
+            # e.g. "Event 'new' on sink #12" / "Event 'remove' on sink #12"
+            if " on sink #" in line and "'change'" not in line:
+                _invalidate_sinks()
+        proc.wait()
+    except Exception as exc:  # noqa: BLE001
+        log.warning("pactl subscribe watcher failed: %s", exc)
+    finally:
+        # Without a watcher the cache could go stale – drop it; the next
+        # list_sinks() call starts a fresh watcher.
+        with _SINKS_LOCK:
+            _SINK_WATCHER = None
+        _invalidate_sinks()
+
+class _PAQueue:
+    """Coalesce pactl commands issued in quick succession (slider drags).
+
+    Commands are keyed by ``(verb, target)``; when the flush timer fires only
+    the latest command per key is executed, so a burst of volume updates for
+    one sink costs a single fork/exec.
+    """
+
+    FLUSH_MS = 20
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._scheduled = False
+
+    def submit(self, *args: str) -> None:
+        key = args[:2]
+        with self._lock:
+            self._pending.pop(key, None)      # re-insert → keep latest order
+            self._pending[key] = args
+            if self._scheduled:
+                return
+            self._scheduled = True
+        GLib.timeout_add(self.FLUSH_MS, self._flush)
+
+    def _flush(self) -> bool:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        for args in pending.values():
+            result = subprocess.run(["pactl", *args], capture_output=True, text=True)
+            if result.returncode != 0:
+                log.warning("pactl %s failed: %s", " ".join(args), result.stderr.strip())
+        return False  # one-shot timer
+
+_PA_QUEUE = _PAQueue()
+
+def queue_pactl(*args: str) -> None:
+    """Schedule ``pactl *args``; superseded by a later call for the same target."""
+    _PA_QUEUE.submit(*args)
+
+def unload_loopback_module(module_id: int) -> bool:
+    """Unload a single module by *module_id*; False if PulseAudio refused."""
+    result = subprocess.run(["pactl", "unload-module", str(module_id)],
+                            capture_output=True, text=True)
+    return result.returncode == 0
+
+def remove_loopback_for_device(mac: str, module_id: Optional[int] = None):
+    """Unload every loopback that targets the *sink* of the given BT MAC.
+
+    With a known *module_id* the module is unloaded directly; the module list
+    is only scanned when that id is unknown or has gone stale.
+    """
+    sink_name = a2dp_sink_name(mac)
+    if module_id is not None and unload_loopback_module(module_id):
+        log.info("🗑️  Removed loopback module %s for %s", module_id, sink_name)
+        return
     log.info("🗑️  Removing loopback(s) for %s", sink_name)
-    subprocess.call(["pactl", "unload-module", f"module-loopback sink={sink_name}"])
+    for module_id in _loopback_module_ids_for(sink_name):
+        subprocess.call(["pactl", "unload-module", module_id])
+
+def _loopback_module_ids_for(sink_name: str) -> List[str]:
+    """Return the ids of every module-loopback whose ``sink=`` is *sink_name*."""
+    modules_output = subprocess.run(["pactl", "list", "short", "modules"],
+                                    capture_output=True, text=True)
+    ids: List[str] = []
+    for line in modules_output.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) < 3 or parts[1] != "module-loopback":
+            continue
+        match = _SINK_ARG_RE.search(parts[2])
+        if match and match.group(1) == sink_name:
+            ids.append(parts[0])
+    return ids
+
+def _pulse_socket_path() -> str:
+    """Return the native-protocol socket path PulseAudio clients will use."""
+    server = os.environ.get("PULSE_SERVER", "")
+    if server.startswith("unix:"):
+        return server[len("unix:"):]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    return os.path.join(runtime_dir, "pulse", "native")
+
+def _pulse_socket_alive(timeout: float = 0.1) -> bool:
+    """Cheap liveness probe: can we connect to the daemon's socket?"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(_pulse_socket_path())
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+def _pulse_responsive() -> bool:
+    """True if the daemon answers; a connectable socket saves forking `pactl info`."""
+    if _pulse_socket_alive():
+        log.info("PulseAudio socket %s is accepting connections", _pulse_socket_path())
+        return True
+    info_result = subprocess.run(["pactl", "info"], capture_output=True, text=True)
+    return info_result.returncode == 0 and "Server Name" in info_result.stdout
 
 def setup_pulseaudio() -> bool:
     """Ensure PulseAudio is running and prepare a virtual_out sink.
@@ -30,9 +230,7 @@ def setup_pulseaudio() -> bool:
 
         # Step 1: Check if PulseAudio is currently running
         log.info("Checking if PulseAudio daemon is responsive...")
-        info_result = subprocess.run(["pactl", "info"], capture_output=True, text=True)
-
-        if info_result.returncode != 0 or "Server Name" not in info_result.stdout:
+        if not _pulse_responsive():
             log.warning("PulseAudio not responding, attempting to start it")
 
             # Start PulseAudio with no idle timeout
@@ -84,29 +282,18 @@ def setup_pulseaudio() -> bool:
         return False
 
 
-def create_loopback(expected_sink_prefix: str, latency_ms: int = 100, wait_seconds: int = 5) -> bool:
+def create_loopback(expected_sink_prefix: str, latency_ms: int = 100, wait_seconds: int = 5) -> Optional[int]:
     """
     Waits for a specific sink to appear (matching by prefix), unloads any existing loopbacks for it,
-    and then creates a clean new loopback.
+    and then creates a clean new loopback.  Returns the new module id, or None on failure.
     """
     def find_actual_sink_name() -> str:
-        result = subprocess.run(["pactl", "list", "sinks", "short"],
-                                capture_output=True, text=True)
-        for line in result.stdout.strip().splitlines():
-            parts = line.split()
-            if len(parts) >= 2 and parts[1].startswith(expected_sink_prefix):
-                return parts[1]
-        return None
+        return find_sink(expected_sink_prefix)
 
     def unload_conflicting_loopbacks(actual_sink_name: str):
-        modules_output = subprocess.run(["pactl", "list", "short", "modules"],
-                                        capture_output=True, text=True)
-        for line in modules_output.stdout.strip().splitlines():
-            parts = line.split()
-            if len(parts) >= 2 and "module-loopback" in parts[1] and actual_sink_name in line:
-                module_id = parts[0]
-                log.debug("↺ Unloading conflicting loopback module %s for %s", module_id, actual_sink_name)
-                subprocess.run(["pactl", "unload-module", module_id])
+        for module_id in _loopback_module_ids_for(actual_sink_name):
+            log.debug("↺ Unloading conflicting loopback module %s for %s", module_id, actual_sink_name)
+            subprocess.run(["pactl", "unload-module", module_id])
 
     def load_loopback(actual_sink_name: str):
         """
@@ -131,15 +318,16 @@ def create_loopback(expected_sink_prefix: str, latency_ms: int = 100, wait_secon
             unload_conflicting_loopbacks(actual_sink_name)
             result = load_loopback(actual_sink_name)
             if result.returncode == 0:
-                log.info("✅ Loopback established for %s", actual_sink_name)
-                return True
+                module_id = int(result.stdout.strip())
+                log.info("✅ Loopback established for %s (module %s)", actual_sink_name, module_id)
+                return module_id
             else:
                 log.error("❌ Failed to load loopback module: %s", result.stderr.strip())
-                return False
+                return None
         time.sleep(0.5)
 
     log.error("⏰ Timeout – sink %s not found within %s seconds", expected_sink_prefix, wait_seconds)
-    return False
+    return None
 
 
 
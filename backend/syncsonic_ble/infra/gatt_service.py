@@ -43,8 +43,8 @@ from syncsonic_ble.helpers.dbus_helpers import (
     service_props, characteristic_props, advertisement_props, dbus_path,
 )
 from syncsonic_ble.state_change.action_request_handlers import (
-    HANDLERS as _HANDLERS,
-    unknown_handler as _UNKNOWN_HANDLER,
+    HANDLER_VEC as _HANDLER_VEC,
+    encode_message,
 )
 
 log = get_logger(__name__)
@@ -245,15 +245,15 @@ class Characteristic(dbus.service.Object, DBusPathMixin):
             return
 
         # Normal command --------------------------------------------------
-        msg_type, data = self._decode(value)
-        handler = _HANDLERS.get(msg_type, _UNKNOWN_HANDLER)
+        opcode, data = self._decode(value)
+        handler = _HANDLER_VEC[opcode]
 
         response = handler(self, data)
         self.value = response
         if self.notifying:
             self.PropertiesChanged(
                 GATT_CHRC_IFACE,
-                {"Value": dbus.Array(self.value)},
+                {"Value": dbus.Array(self.value, signature="y")},
                 [],
             )
 
@@ -262,21 +262,20 @@ class Characteristic(dbus.service.Object, DBusPathMixin):
     # ------------------------------------------------------------------
 
     def _encode(self, msg: Msg, payload: Dict[str, Any]):
-        raw = json.dumps(payload).encode()
-        out = [dbus.Byte(msg)] + [dbus.Byte(b) for b in raw]
-        return out
+        return encode_message(msg, payload)
 
     def _decode(self, value):
+        """Return ``(opcode, data)``; *opcode* is the raw int of the first byte."""
         try:
-            msg = Msg(value[0])
+            opcode = int(value[0])
             if len(value) == 1:
-                return msg, {}
+                return opcode, {}
             data = json.loads(bytes(value[1:]).decode())
-            log.info("🧩 Decoded msg_type=%s, data=%s", msg, data)
-            return msg, data
+            log.info("🧩 Decoded msg_type=0x%02x, data=%s", opcode, data)
+            return opcode, data
         except Exception as exc:
             log.error("decode error: %s", exc)
-            return Msg.ERROR, {"error": str(exc)}
+            return int(Msg.ERROR), {"error": str(exc)}
 
     # ------------------------------------------------------------------
     # Notify start/stop ---------------------------------------------------
@@ -2,7 +2,7 @@
 runs the single GLib MainLoop.  Replaces the previous gatt_server,
 event_pump and svc_singleton helpers."""
 
-import sys, os, dbus, dbus.service, dbus.mainloop.glib
+import sys, dbus, dbus.service, dbus.mainloop.glib
 from gi.repository import GLib
 
 # First-party modules -------------------------------------------------------
@@ -10,7 +10,7 @@ from syncsonic_ble.utils.logging_conf import get_logger
 from syncsonic_ble.helpers.pulseaudio_helpers import setup_pulseaudio
 from syncsonic_ble.utils.constants import (
     BLUEZ_SERVICE_NAME, SERVICE_UUID, CHARACTERISTIC_UUID, GATT_MANAGER_IFACE,
-    LE_ADVERTISING_MANAGER_IFACE, AGENT_MANAGER_INTERFACE, AGENT_PATH, reserved
+    LE_ADVERTISING_MANAGER_IFACE, AGENT_MANAGER_INTERFACE, AGENT_PATH, require_reserved_hci
 )
 from syncsonic_ble.state_management.bus_manager import get_bus
 
@@ -49,6 +49,7 @@ def main():
     set_bus(bus)           # for legacy helpers
 
     # 3) BlueZ adapter selection -------------------------------------------
+    reserved = require_reserved_hci()
     adapter_path, adapter = find_adapter(reserved)
     if not adapter_path:
         log.error("No Bluetooth adapter found – aborting")
@@ -109,8 +110,8 @@ def main():
     ad_mgr.RegisterAdvertisement(
         adv.get_path(),
         {},
-        reply_handler=lambda: log.info("✅ Advertisement active on adapter %s", os.getenv("RESERVED_HCI")),
-        error_handler=lambda e: log.error("Advertisement error on %s: %s", os.getenv("RESERVED_HCI"), e),
+        reply_handler=lambda: log.info("✅ Advertisement active on adapter %s", reserved),
+        error_handler=lambda e: log.error("Advertisement error on %s: %s", reserved, e),
     )
 
     # 7) Enter main loop ----------------------------------------------------
@@ -120,6 +121,9 @@ def main():
         loop.run()
     except KeyboardInterrupt:
         log.info("🛑 Server stopped by user")
+    finally:
+        conn_service.stop()
+        dev_mgr.stop()
 
 
 # allow `python -m syncsonic_ble` -------------------------------------------
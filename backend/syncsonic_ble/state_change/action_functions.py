@@ -4,17 +4,101 @@
 # and keeps adapter path computations in one place.
 
 from gi.repository import GLib
-import time
+import threading
 import dbus
 
 from syncsonic_ble.helpers.adapter_helpers import adapter_prefix_from_path  # unified helper
 from syncsonic_ble.helpers.pulseaudio_helpers import remove_loopback_for_device
+from syncsonic_ble.state_management.bus_manager import call_methods_fast
+from syncsonic_ble.utils.constants import DBUS_PROP_IFACE
+
+# Per-operation upper bounds (seconds) instead of libdbus' 25 s default.
+CONNECT_TIMEOUT_S    = 10.0
+PAIR_TIMEOUT_S       = 20.0
+DISCONNECT_TIMEOUT_S = 5.0
+REMOVE_TIMEOUT_S     = 5.0
+SET_TIMEOUT_S        = 5.0
+
+
+def _async_call(method, *args, timeout: float):
+    """Call a dbus-python proxy *method* via reply/error handlers and wait at
+    most *timeout* seconds.  Raises the D-Bus error, or TimeoutError.
+
+    Replies are dispatched by the GLib main loop, so when we *are* the main
+    loop thread (e.g. a signal handler) we fall back to a plain blocking call
+    with the same timeout instead of deadlocking.
+    """
+    if GLib.MainContext.default().is_owner():
+        return method(*args, timeout=timeout)
+
+    done = threading.Event()
+    result: list = []
+    error: list = []
+
+    def _on_reply(*reply):
+        result.extend(reply)
+        done.set()
+
+    def _on_error(exc):
+        error.append(exc)
+        done.set()
+
+    method(*args, reply_handler=_on_reply, error_handler=_on_error, timeout=timeout)
+    if not done.wait(timeout + 1.0):
+        raise TimeoutError(f"D-Bus call timed out after {timeout}s")
+    if error:
+        raise error[0]
+    return result[0] if result else None
+
+
+def _async_call_all(calls, timeout: float) -> list:
+    """Issue every ``(method, args)`` in *calls* at once and wait for all.
+
+    Returns one entry per call: ``None`` on success, otherwise the exception
+    (TimeoutError for calls that did not answer within *timeout*).  Lets N
+    independent BlueZ operations overlap instead of running back to back.
+    """
+    if GLib.MainContext.default().is_owner():
+        outcomes = []
+        for method, args in calls:
+            try:
+                method(*args, timeout=timeout)
+                outcomes.append(None)
+            except Exception as exc:  # noqa: BLE001
+                outcomes.append(exc)
+        return outcomes
+
+    lock = threading.Lock()
+    done = threading.Event()
+    outcomes: list = [TimeoutError(f"D-Bus call timed out after {timeout}s")] * len(calls)
+    remaining = [len(calls)]
+
+    def _finish(index, exc=None):
+        with lock:
+            outcomes[index] = exc
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    if not calls:
+        return []
+    for index, (method, args) in enumerate(calls):
+        method(
+            *args,
+            reply_handler=lambda *_, i=index: _finish(i),
+            error_handler=lambda exc, i=index: _finish(i, exc),
+            timeout=timeout,
+        )
+    done.wait(timeout + 1.0)
+    with lock:
+        return list(outcomes)
+
 
 def connect_device_dbus(device_path: str, bus) -> bool:
     try:
         dev_obj = bus.get_object("org.bluez", device_path)
         device = dbus.Interface(dev_obj, "org.bluez.Device1")
-        device.Connect()
+        _async_call(device.Connect, timeout=CONNECT_TIMEOUT_S)
         return True
     except Exception as e:
      
@@ -24,8 +108,8 @@ def connect_device_dbus(device_path: str, bus) -> bool:
 def trust_device_dbus(device_path: str, bus) -> bool:
     try:
         dev_obj = bus.get_object("org.bluez", device_path)
-        device = dbus.Interface(dev_obj, "org.bluez.Device1")
-        device.Set("org.bluez.Device1", "Trusted", dbus.Boolean(True))
+        props = dbus.Interface(dev_obj, DBUS_PROP_IFACE)
+        _async_call(props.Set, "org.bluez.Device1", "Trusted", dbus.Boolean(True), timeout=SET_TIMEOUT_S)
         return True
     except Exception as e:
     
@@ -34,10 +118,9 @@ def trust_device_dbus(device_path: str, bus) -> bool:
 
 def pair_device_dbus(device_path: str, bus) -> bool:
     try:
-        time.sleep(1.5)
         dev_obj = bus.get_object("org.bluez", device_path)
         device = dbus.Interface(dev_obj, "org.bluez.Device1")
-        device.Pair()
+        _async_call(device.Pair, timeout=PAIR_TIMEOUT_S)
         return True
     except Exception as e:
         if "AlreadyExists" in str(e):
@@ -53,7 +136,7 @@ def remove_device_dbus(device_path: str, bus) -> bool:
     try:
         ad_obj = bus.get_object("org.bluez", adapter_path)
         adapter = dbus.Interface(ad_obj, "org.bluez.Adapter1")
-        adapter.RemoveDevice(device_path)
+        _async_call(adapter.RemoveDevice, device_path, timeout=REMOVE_TIMEOUT_S)
         return True
     except Exception as e:
   
@@ -68,7 +151,7 @@ def disconnect_device_dbus(device_path: str, mac: str, bus) -> bool:
     try:
         dev_obj = bus.get_object("org.bluez", device_path)
         device = dbus.Interface(dev_obj, "org.bluez.Device1")
-        device.Disconnect()
+        _async_call(device.Disconnect, timeout=DISCONNECT_TIMEOUT_S)
         remove_loopback_for_device(mac)
 
         return True
@@ -77,30 +160,52 @@ def disconnect_device_dbus(device_path: str, mac: str, bus) -> bool:
         return False
     
 
+def disconnect_devices_dbus(targets: list[tuple[str, str]], bus, drop_loopbacks: bool = True) -> list[bool]:
+    """
+    Disconnect every ``(device_path, mac)`` in *targets* concurrently and drop
+    the loopbacks of those that succeeded.  Returns one bool per target.
+
+    Pass ``drop_loopbacks=False`` when the caller tracks loopback module ids
+    itself and will release them.
+    """
+    results = [False] * len(targets)
+    indices = [index for index, (device_path, _mac) in enumerate(targets) if device_path]
+    outcomes = call_methods_fast(
+        [targets[index][0] for index in indices], "org.bluez.Device1", "Disconnect", DISCONNECT_TIMEOUT_S
+    ) if indices else []
+    if outcomes is None:  # no dbus-fast – overlap the calls via dbus-python
+        calls, kept = [], []
+        for index in indices:
+            try:
+                dev_obj = bus.get_object("org.bluez", targets[index][0])
+            except Exception:
+                continue
+            calls.append((dbus.Interface(dev_obj, "org.bluez.Device1").Disconnect, ()))
+            kept.append(index)
+        indices, outcomes = kept, _async_call_all(calls, DISCONNECT_TIMEOUT_S)
+
+    for index, exc in zip(indices, outcomes):
+        if exc is None:
+            if drop_loopbacks:
+                remove_loopback_for_device(targets[index][1])
+            results[index] = True
+    return results
+
+
 def disconnect_all_instances(mac: str, objects: dict, bus) -> bool:
     """
     Disconnects the given device from all controllers where it is currently connected.
     Uses the full D-Bus object tree instead of any global state.
     """
     mac = mac.upper()
-    mac_fmt = mac.replace(":", "_")
-    attempted = False
+    targets = []
 
     for path, ifaces in objects.items():
-        if "org.bluez.Device1" in ifaces:
-            dev_obj = bus.get_object("org.bluez", path)
-            device = dbus.Interface(dev_obj, "org.bluez.Device1")
-            address = dev_obj.get("Address", "").upper()
-            connected = dev_obj.get("Connected", False)
-            if address == mac and connected:
-                try:
-                    device.Disconnect()
-                    remove_loopback_for_device(mac)
-             
-                    attempted = True
-                except Exception as e:
-                    pass
-                   
-
-
-    return attempted
+        dev = ifaces.get("org.bluez.Device1")
+        if not dev:
+            continue
+        # GetManagedObjects already carries Address/Connected – no proxy needed
+        if dev.get("Address", "").upper() == mac and dev.get("Connected", False):
+            targets.append((path, mac))
+
+    return any(disconnect_devices_dbus(targets, bus))
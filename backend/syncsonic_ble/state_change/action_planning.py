@@ -1,12 +1,22 @@
 from syncsonic_ble.utils.logging_conf import get_logger
-from syncsonic_ble.helpers.adapter_helpers import device_path_on_adapter
-import os
-import dbus
+from syncsonic_ble.helpers.adapter_helpers import device_path_on_adapter, get_managed_objects
+from syncsonic_ble.utils.constants import require_reserved_hci
 logger = get_logger(__name__)
 
-reserved = os.getenv("RESERVED_HCI")
-if not reserved:
-    raise RuntimeError("RESERVED_HCI not set – cannot pick phone adapter")
+# Next FSM step for every (paired, trusted, connected, has_audio) combination,
+# indexed by the 4-bit state packed in analyze_device().
+_ACTION = ["run_discovery"] * 16
+for _state in range(16):
+    _paired, _trusted, _connected, _audio = (bool(_state & bit) for bit in (8, 4, 2, 1))
+    if _connected and _audio:
+        _ACTION[_state] = "already_connected"
+    elif not _paired:
+        _ACTION[_state] = "pair"
+    elif not _trusted:
+        _ACTION[_state] = "trust"
+    elif not _connected:
+        _ACTION[_state] = "connect"
+del _state, _paired, _trusted, _connected, _audio
 
 def connect_one_plan(target_mac: str, allowed_macs: list[str], objects: dict) -> tuple[str, str, list[tuple[str, str]]]:
     """
@@ -26,6 +36,7 @@ def connect_one_plan(target_mac: str, allowed_macs: list[str], objects: dict) ->
             - Controller MAC address to use (if applicable)
             - List of (device_mac, controller_mac) tuples to disconnect
     """
+    reserved = require_reserved_hci()
     target_mac = target_mac.upper()
     allowed_macs = [mac.upper() for mac in allowed_macs]
     disconnect_list = []
@@ -43,8 +54,8 @@ def connect_one_plan(target_mac: str, allowed_macs: list[str], objects: dict) ->
                 continue  # Skip reserved adapter
             adapters[addr] = path
 
-    logger.info(f"Planning connection for target: {target_mac}")
-    logger.info(f"Allowed MACs in config: {allowed_macs}")
+    logger.info("Planning connection for target: %s", target_mac)
+    logger.info("Allowed MACs in config: %s", allowed_macs)
 
     # Analyze all devices
     for path, ifaces in objects.items():
@@ -64,81 +75,86 @@ def connect_one_plan(target_mac: str, allowed_macs: list[str], objects: dict) ->
             continue  # This device does not belong to a recognized adapter
 
         if dev.get("Connected", False):
-            logger.info(f"Found connected device: {dev_mac} on {ctrl_mac}")
+            logger.debug("Found connected device: %s on %s", dev_mac, ctrl_mac)
 
             if dev_mac in allowed_macs:
                 config_speaker_usage.setdefault(dev_mac, []).append(ctrl_mac)
 
             if dev_mac == target_mac:
                 target_connected_on.append(ctrl_mac)
-                logger.info(f"Target {dev_mac} already connected on {ctrl_mac}")
+                logger.debug("Target %s already connected on %s", dev_mac, ctrl_mac)
 
             elif dev_mac not in allowed_macs:
                 disconnect_list.append((dev_mac, ctrl_mac))
-                logger.info(f"Out-of-config device {dev_mac} → marked for disconnection")
+                logger.debug("Out-of-config device %s → marked for disconnection", dev_mac)
 
             elif dev_mac in allowed_macs:
                 used_controllers.add(ctrl_mac)
-                logger.info(f"Config speaker {dev_mac} occupies controller {ctrl_mac}")
+                logger.debug("Config speaker %s occupies controller %s", dev_mac, ctrl_mac)
 
-    logger.info(f"Target is currently connected on: {target_connected_on}")
-    logger.info(f"Disconnect list built: {disconnect_list}")
-    logger.info(f"Controllers in use by config devices: {used_controllers}")
+    logger.info("Target is currently connected on: %s", target_connected_on)
+    logger.info("Disconnect list built: %s", disconnect_list)
+    logger.info("Controllers in use by config devices: %s", used_controllers)
 
     # Handle multiple connections of target
     if len(target_connected_on) > 1:
         controller_to_keep = target_connected_on[0]
         for ctrl_mac in target_connected_on[1:]:
             disconnect_list.append((target_mac, ctrl_mac))
-        logger.info(f"Target connected on multiple controllers, keeping {controller_to_keep}, disconnecting others")
+        logger.info("Target connected on multiple controllers, keeping %s, disconnecting others", controller_to_keep)
         return "already_connected", controller_to_keep, disconnect_list
 
     # Target connected once: ensure it's not sharing with another config speaker
     if len(target_connected_on) == 1:
         controller = target_connected_on[0]
+        # Controller -> first other config speaker on it, built in one pass
+        shared_ctrls = {}
         for mac, controllers in config_speaker_usage.items():
-            if mac != target_mac and controller in controllers:
-                disconnect_list.append((target_mac, controller))
-                logger.info(f"Target {target_mac} shares controller {controller} with config speaker {mac}, reallocating")
+            if mac != target_mac:
+                for ctrl in controllers:
+                    shared_ctrls.setdefault(ctrl, mac)
 
-                # Try to find a free controller
-                for new_ctrl_mac in adapters:
-                    if new_ctrl_mac not in used_controllers and new_ctrl_mac != controller:
-                        logger.info(f"Assigning free controller {new_ctrl_mac} to target {target_mac}")
-                        return "needs_connection", new_ctrl_mac, disconnect_list
+        if controller not in shared_ctrls:
+            return "already_connected", controller, disconnect_list
 
-                # Fallback: free a duplicate
-                for mac2, controllers2 in config_speaker_usage.items():
-                    if len(controllers2) > 1:
-                        ctrl_to_free = controllers2[1]
-                        disconnect_list.append((mac2, ctrl_to_free))
-                        logger.info(f"Freeing {ctrl_to_free} from {mac2} to connect target {target_mac}")
-                        return "needs_connection", ctrl_to_free, disconnect_list
+        disconnect_list.append((target_mac, controller))
+        logger.info("Target %s shares controller %s with config speaker %s, reallocating", target_mac, controller, shared_ctrls[controller])
 
-                logger.info(f"No controller available after rebalance for target {target_mac}")
-                return "error", "", disconnect_list
+        # Try to find a free controller
+        for new_ctrl_mac in adapters:
+            if new_ctrl_mac not in used_controllers and new_ctrl_mac != controller:
+                logger.info("Assigning free controller %s to target %s", new_ctrl_mac, target_mac)
+                return "needs_connection", new_ctrl_mac, disconnect_list
 
-        return "already_connected", controller, disconnect_list
+        # Fallback: free a duplicate
+        for mac2, controllers2 in config_speaker_usage.items():
+            if len(controllers2) > 1:
+                ctrl_to_free = controllers2[1]
+                disconnect_list.append((mac2, ctrl_to_free))
+                logger.info("Freeing %s from %s to connect target %s", ctrl_to_free, mac2, target_mac)
+                return "needs_connection", ctrl_to_free, disconnect_list
+
+        logger.info("No controller available after rebalance for target %s", target_mac)
+        return "error", "", disconnect_list
 
     # Target is not currently connected anywhere
     for ctrl_mac in adapters:
         if ctrl_mac not in used_controllers:
-            logger.info(f"Free controller {ctrl_mac} found for target {target_mac}")
+            logger.info("Free controller %s found for target %s", ctrl_mac, target_mac)
             return "needs_connection", ctrl_mac, disconnect_list
 
     for mac, controllers in config_speaker_usage.items():
         if len(controllers) > 1:
             ctrl_to_free = controllers[1]
             disconnect_list.append((mac, ctrl_to_free))
-            logger.info(f"Freeing controller {ctrl_to_free} from {mac} to connect target {target_mac}")
+            logger.info("Freeing controller %s from %s to connect target %s", ctrl_to_free, mac, target_mac)
             return "needs_connection", ctrl_to_free, disconnect_list
 
-    logger.info(f"No available controller found for target {target_mac}")
+    logger.info("No available controller found for target %s", target_mac)
     return "error", "", disconnect_list
 
 def analyze_device(bus, adapter_mac: str, dev_mac: str) -> str:
-    om = dbus.Interface(bus.get_object("org.bluez", "/"), "org.freedesktop.DBus.ObjectManager")
-    objects = om.GetManagedObjects()
+    objects = get_managed_objects(bus)
 
     # Locate the Device1 dictionary for this mac *on the chosen adapter*
     dev_path = device_path_on_adapter(bus, adapter_mac, dev_mac)
@@ -154,12 +170,5 @@ def analyze_device(bus, adapter_mac: str, dev_mac: str) -> str:
 
     has_audio  = any("110b" in u.lower() for u in uuids)  # A2DP/AVRCP
 
-    if connected and has_audio:
-        return "already_connected"
-    if not paired:
-        return "pair"
-    if not trusted:
-        return "trust"
-    if paired and trusted and not connected:
-        return "connect"
-    return "run_discovery"
\ No newline at end of file
+    state = (bool(paired) << 3) | (bool(trusted) << 2) | (bool(connected) << 1) | bool(has_audio)
+    return _ACTION[state]
\ No newline at end of file
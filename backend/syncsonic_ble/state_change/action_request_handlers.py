@@ -1,81 +1,108 @@
 from __future__ import annotations
 
-import dbus, subprocess, os, json
+import dbus, json
 import threading
 from typing import Dict, Any
-from syncsonic_ble.utils.constants import Msg, DBUS_PROP_IFACE, DBUS_OM_IFACE, DEVICE_INTERFACE, BLUEZ_SERVICE_NAME, ADAPTER_INTERFACE
-from syncsonic_ble.helpers.pulseaudio_helpers import create_loopback
+from syncsonic_ble.utils.constants import Msg, DBUS_PROP_IFACE, DEVICE_INTERFACE, BLUEZ_SERVICE_NAME, ADAPTER_INTERFACE, require_reserved_hci
+from syncsonic_ble.helpers.pulseaudio_helpers import create_loopback, bluez_sink_prefix, a2dp_sink_name, find_sink, list_sinks, queue_pactl
 from syncsonic_ble.utils.logging_conf import get_logger
 from syncsonic_ble.state_management.scan_manager import ScanManager
+from syncsonic_ble.helpers.adapter_helpers import get_managed_objects
 
 logger = get_logger(__name__)
 
-def _encode(msg: Msg, payload: Dict[str, Any]):
-    raw = json.dumps(payload).encode()
-    out = [dbus.Byte(msg)] + [dbus.Byte(b) for b in raw]
-    return out
+def _json_bytes(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+try:  # optional – orjson serialises straight to compact bytes
+    import orjson
+
+    def _dumps(payload: Dict[str, Any]) -> bytes:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:  # e.g. non-str keys – let the stdlib decide
+            return _json_bytes(payload)
+except ImportError:
+    _dumps = _json_bytes
+
+def encode_message(msg: Msg, payload: Dict[str, Any]):
+    """Frame *payload* as a ``<msg byte><JSON>`` byte array for GATT."""
+    raw = _dumps(payload)
+    out = bytearray(len(raw) + 1)
+    out[0] = msg
+    out[1:] = raw
+    return dbus.Array(out, signature="y")
+
+def _unpack(data, *keys):
+    """Return ``data[k]`` (or None) for each key in one pass.
+
+    Also tolerates a JSON payload that is not an object (e.g. a bare list),
+    which would otherwise blow up on ``.get``.
+    """
+    if not isinstance(data, dict):
+        data = {}
+    return tuple(map(data.get, keys))
 
 # Each handler receives the Characteristic instance (self) and the parsed data dict.
 
 def handle_ping(char, data):
-    count = data.get("count", 0)
-    return _encode(Msg.PONG, {"count": count})
+    return encode_message(Msg.PONG, {"count": data.get("count", 0) if isinstance(data, dict) else 0})
 
 
 def handle_connect_one(char, data):
     from syncsonic_ble.state_management.connection_manager import Intent
     service = char.connection_service
-    tgt = data.get("targetSpeaker", {})
-    mac = tgt.get("mac")
+    tgt, allowed = _unpack(data, "targetSpeaker", "allowed")
+    mac, name = _unpack(tgt, "mac", "name")
     if not mac:
-        return _encode(Msg.ERROR, {"error": "Missing targetSpeaker.mac"})
+        return encode_message(Msg.ERROR, {"error": "Missing targetSpeaker.mac"})
 
     payload = {
         "mac": mac,
-        "friendly_name": tgt.get("name", ""),
-        "allowed": data.get("allowed", []),
+        "friendly_name": name or "",
+        "allowed": allowed or [],
     }
     logger.info("Queuing CONNECT_ONE %s", payload)
     if service:
         service.submit(Intent.CONNECT_ONE, payload)
     if char.device_manager:
         char.device_manager.connected.add(mac)
-    return _encode(Msg.SUCCESS, {"queued": True})
+    return encode_message(Msg.SUCCESS, {"queued": True})
 
 
 def handle_disconnect(char, data):
     from syncsonic_ble.state_management.connection_manager import Intent
     service = char.connection_service
-    mac = data.get("mac")
+    mac, = _unpack(data, "mac")
     if not mac:
-        return _encode(Msg.ERROR, {"error": "Missing mac"})
+        return encode_message(Msg.ERROR, {"error": "Missing mac"})
     if service:
         service.submit(Intent.DISCONNECT, {"mac": mac})
-    return _encode(Msg.SUCCESS, {"queued": True})
+    return encode_message(Msg.SUCCESS, {"queued": True})
 
 
 def handle_set_latency(char, data):
-    mac = data.get("mac"); latency = data.get("latency")
+    mac, latency = _unpack(data, "mac", "latency")
     if mac is None or latency is None:
-        return _encode(Msg.ERROR, {"error": "Missing mac/latency"})
-    sink_prefix = f"bluez_sink.{mac.replace(':', '_')}"
-    ok = create_loopback(sink_prefix, latency_ms=int(latency))
-    if ok:
-        # Add to loopbacks set if we have access to the connection service
-        if char.connection_service:
-            char.connection_service.loopbacks.add(mac)
-            logger.info(f"✅ Added {mac} to loopbacks set after latency update")
-        return _encode(Msg.SUCCESS, {"latency": latency})
-    return _encode(Msg.ERROR, {"error": "loopback failed"})
+        return encode_message(Msg.ERROR, {"error": "Missing mac/latency"})
+    service = char.connection_service
+    if service:
+        # the service owns loopback bookkeeping; a failure is notified
+        from syncsonic_ble.state_management.connection_manager import Intent
+        service.submit(Intent.SET_LATENCY, {"mac": mac, "latency": int(latency)})
+        return encode_message(Msg.SUCCESS, {"latency": latency})
+    if create_loopback(bluez_sink_prefix(mac), latency_ms=int(latency)) is not None:
+        return encode_message(Msg.SUCCESS, {"latency": latency})
+    return encode_message(Msg.ERROR, {"error": "loopback failed"})
 
 
 def handle_set_volume(char, data):
-    mac = data.get("mac"); volume = data.get("volume")
+    mac, volume, balance = _unpack(data, "mac", "volume", "balance")
     if mac is None or volume is None:
-        return _encode(Msg.ERROR, {"error": "Missing mac/volume"})
+        return encode_message(Msg.ERROR, {"error": "Missing mac/volume"})
 
     # balance is optional, defaults to centered (0.5)
-    balance = float(data.get("balance", 0.5))
+    balance = 0.5 if balance is None else float(balance)
 
     # Clamp balance to [0.0, 1.0]
     balance = max(0.0, min(1.0, balance))
@@ -94,72 +121,101 @@ def handle_set_volume(char, data):
     left  = min(max(left, 0), 150)
     right = min(max(right, 0), 150)
 
-    sink_name = f"bluez_sink.{mac.replace(':', '_')}.a2dp_sink"
-    result = subprocess.run([
-        "pactl", "set-sink-volume", sink_name, f"{left}%", f"{right}%"
-    ], capture_output=True, text=True)
+    # Coalesced with other updates for this sink; failures are logged on flush
+    queue_pactl("set-sink-volume", a2dp_sink_name(mac), f"{left}%", f"{right}%")
+    return encode_message(Msg.SUCCESS, {"left": left, "right": right})
+
 
-    if result.returncode == 0:
-        return _encode(Msg.SUCCESS, {"left": left, "right": right})
-    return _encode(Msg.ERROR, {"error": result.stderr.strip() or "volume failed"})
+# Address → name of paired devices; rebuilt on demand after BlueZ signals a
+# change (see invalidate_paired_cache, wired up by ConnectionService).
+_paired_cache: Dict[str, str] | None = None
 
+# Device1 properties that change what GET_PAIRED_DEVICES reports
+PAIRED_CACHE_PROPS = frozenset(("Paired", "Alias", "Name", "Address"))
+
+def invalidate_paired_cache() -> None:
+    global _paired_cache
+    _paired_cache = None
 
 def handle_get_paired(char, _):
-    om = dbus.Interface(char.bus.get_object("org.bluez", "/"), DBUS_OM_IFACE)
-    paired = {
-        v.get("Address"): (v.get("Alias") or v.get("Name"))
-        for _, ifs in om.GetManagedObjects().items()
-        if (v := ifs.get(DEVICE_INTERFACE)) and v.get("Paired", False)
-    }
-    return _encode(Msg.SUCCESS, paired or {"message": "No devices"})
+    global _paired_cache
+    paired = _paired_cache
+    if paired is None:
+        paired = {
+            v.get("Address"): (v.get("Alias") or v.get("Name"))
+            for _, ifs in get_managed_objects(char.bus).items()
+            if (v := ifs.get(DEVICE_INTERFACE)) and v.get("Paired", False)
+        }
+        _paired_cache = paired
+    return encode_message(Msg.SUCCESS, paired or {"message": "No devices"})
 
 
 def handle_set_mute(char, data):
-    mac = data.get("mac"); mute = data.get("mute")
+    mac, mute = _unpack(data, "mac", "mute")
     if mac is None or mute is None:
-        return _encode(Msg.ERROR, {"error": "Missing mac/mute"})
-    mac_fmt = mac.replace(":", "_")
-    proc = subprocess.run(["pactl", "list", "sinks", "short"], capture_output=True, text=True)
-    if proc.returncode != 0:
-        return _encode(Msg.ERROR, {"error": "Cannot list sinks"})
-    sink_name = next((l.split()[1] for l in proc.stdout.splitlines() if mac_fmt in l), None)
+        return encode_message(Msg.ERROR, {"error": "Missing mac/mute"})
+    sink_name = find_sink(bluez_sink_prefix(mac))
     if not sink_name:
-        return _encode(Msg.ERROR, {"error": "sink not found"})
+        if list_sinks() is None:
+            return encode_message(Msg.ERROR, {"error": "Cannot list sinks"})
+        return encode_message(Msg.ERROR, {"error": "sink not found"})
     flag = "1" if mute else "0"
-    subprocess.run(["pactl", "set-sink-mute", sink_name, flag], check=True)
-    return _encode(Msg.SUCCESS, {"mac": mac, "mute": mute})
+    queue_pactl("set-sink-mute", sink_name, flag)
+    return encode_message(Msg.SUCCESS, {"mac": mac, "mute": mute})
 
 # SCAN handlers ------------------------------------------------------------
 
+# Resolved once per process: the reserved adapter's MAC and a ScanManager for
+# when no ConnectionService (and thus its ScanManager) is attached.
+_reserved_adapter_mac: str | None = None
+_fallback_scan_mgr: ScanManager | None = None
+
+def _scan_target(char):
+    """Return ``(scan_manager, adapter_mac)`` for the reserved adapter."""
+    global _reserved_adapter_mac, _fallback_scan_mgr
+    if _reserved_adapter_mac is None:
+        adapter_path = f"/org/bluez/{require_reserved_hci()}"
+        obj = char.bus.get_object(BLUEZ_SERVICE_NAME, adapter_path)
+        _reserved_adapter_mac = str(obj.Get(ADAPTER_INTERFACE, "Address", dbus_interface=DBUS_PROP_IFACE))
+        logger.info("→ [SCAN_START] Found adapter %s (%s)", adapter_path, _reserved_adapter_mac)
+    if char.connection_service:
+        return char.connection_service.scan, _reserved_adapter_mac
+    if _fallback_scan_mgr is None:
+        _fallback_scan_mgr = ScanManager()
+    return _fallback_scan_mgr, _reserved_adapter_mac
+
 def _scan_start(char, _):
-    hci = os.getenv("RESERVED_HCI")
-    adapter_path = f"/org/bluez/{hci}"
+    global _reserved_adapter_mac
+    if char._scan_mgr:
+        return encode_message(Msg.SUCCESS, {"scanning": True})  # already holding a ref
     try:
-        obj = char.bus.get_object(BLUEZ_SERVICE_NAME, adapter_path)
-        props = dbus.Interface(obj, DBUS_PROP_IFACE)
-        adapter_mac = props.Get(ADAPTER_INTERFACE, "Address")
-        logger.info("→ [SCAN_START] Found adapter %s (%s)", adapter_path, adapter_mac)
-        char._scan_mgr = ScanManager()
-        char._scan_mgr.ensure_discovery(adapter_mac)
+        scan_mgr, adapter_mac = _scan_target(char)
+        try:
+            scan_mgr.ensure_discovery(adapter_mac)
+        except ValueError:
+            # reserved adapter went away – re-resolve on the next request
+            _reserved_adapter_mac = None
+            raise
+        char._scan_mgr = scan_mgr
         char.device_manager.scanning = True if char.device_manager else None
         char._scan_adapter_mac = adapter_mac
     except Exception as e:
-        return _encode(Msg.ERROR, {"error": "Adapter not found"})
-    return _encode(Msg.SUCCESS, {"scanning": True})
+        return encode_message(Msg.ERROR, {"error": "Adapter not found"})
+    return encode_message(Msg.SUCCESS, {"scanning": True})
 
 
 def _scan_stop(char, _):
     if not char._scan_mgr or not char._scan_adapter_mac:
-        return _encode(Msg.ERROR, {"error": "Scan not active"})
+        return encode_message(Msg.ERROR, {"error": "Scan not active"})
     try:
         char._scan_mgr.release_discovery(char._scan_adapter_mac)
     except Exception:
-        return _encode(Msg.ERROR, {"error": "Could not stop scan"})
+        return encode_message(Msg.ERROR, {"error": "Could not stop scan"})
     if char.device_manager:
         char.device_manager.scanning = False
     char._scan_mgr = None
     char._scan_adapter_mac = None
-    return _encode(Msg.SUCCESS, {"scanning": False})
+    return encode_message(Msg.SUCCESS, {"scanning": False})
 
 
 def _run_ultrasonic_sync_worker(char):
@@ -186,13 +242,13 @@ def handle_ultrasonic_sync(char, _):
     """Queue one ultrasonic sync cycle; result is sent via notification when done."""
     t = threading.Thread(target=_run_ultrasonic_sync_worker, args=(char,), daemon=True)
     t.start()
-    return _encode(Msg.SUCCESS, {"queued": True, "message": "Ultrasonic sync started."})
+    return encode_message(Msg.SUCCESS, {"queued": True, "message": "Ultrasonic sync started."})
 
 
 # -------------------------------------------------------------------------
 
 def unknown_handler(char, _):
-    return _encode(Msg.ERROR, {"error": "Unknown message"})
+    return encode_message(Msg.ERROR, {"error": "Unknown message"})
 
 HANDLERS = {
     Msg.PING: handle_ping,
@@ -205,4 +261,10 @@ HANDLERS = {
     Msg.ULTRASONIC_SYNC: handle_ultrasonic_sync,
     Msg.SCAN_START: _scan_start,
     Msg.SCAN_STOP: _scan_stop,
-} 
\ No newline at end of file
+}
+
+# Dense opcode → handler table so WriteValue can index by the raw first byte
+HANDLER_VEC = [unknown_handler] * 256
+for _msg, _handler in HANDLERS.items():
+    HANDLER_VEC[_msg] = _handler
+del _msg, _handler 
\ No newline at end of file
@@ -17,14 +17,33 @@ bus = get_bus()              # safe in any thread
 ```
 The connection lives until the Python interpreter exits; BlueZ cleans up the
 socket automatically, so you don't need an explicit shutdown.
+
+If the optional **dbus-fast** package is installed, the heavy
+``ObjectManager.GetManagedObjects`` reply is fetched over a second, private
+dbus-fast connection (see :func:`get_managed_objects_fast`).  Its marshaller
+is several times faster than dbus-python's for the large ``a{oa{sa{sv}}}``
+BlueZ replies.  It runs on its own asyncio loop thread, so the GLib main loop
+is left untouched.  The same connection also serves
+:func:`call_methods_fast`, which issues a batch of BlueZ method calls
+concurrently with a real per-call timeout that cancels the pending call.
+
+Everything that *exports* objects (GATT application, agent, advertisement)
+stays on dbus-python; the dbus-fast path is strictly an accelerator for
+outgoing calls and degrades to dbus-python when the package is missing.
 """
 
 from __future__ import annotations
 
+import asyncio
 import threading
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import dbus
 
+from syncsonic_ble.utils.constants import BLUEZ_OM_PATH, BLUEZ_SERVICE_NAME, DBUS_OM_IFACE
+from syncsonic_ble.utils.logging_conf import get_logger
+
+log = get_logger(__name__)
+
 # ---------------------------------------------------------------------------
 # Internal synchronisation primitives
 # ---------------------------------------------------------------------------
@@ -32,6 +51,15 @@ import dbus
 _LOCK = threading.Lock()          # guards first-time creation
 _BUS: Optional[dbus.bus.BusConnection] = None  # the singleton instance
 
+_FAST_LOCK = threading.Lock()     # guards first-time dbus-fast setup
+_FAST: Optional["_FastBus"] = None
+_FAST_DISABLED = False            # set once dbus-fast is missing or broken
+
+_OM_LOCK = threading.Lock()       # guards _OM_HANDLERS registration
+# signal name → handlers; lists are replaced, never mutated, so the fan-out
+# can iterate without the lock
+_OM_HANDLERS: Dict[str, List[Callable[[Any, Any], None]]] = {}
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -54,3 +82,149 @@ def get_bus() -> dbus.bus.BusConnection:
             if _BUS is None:
                 _BUS = dbus.SystemBus()
     return _BUS
+
+
+def subscribe_object_manager(signal_name: str, handler: Callable[[Any, Any], None]) -> None:
+    """Call ``handler(object_path, interfaces)`` on every BlueZ *signal_name*
+    (``"InterfacesAdded"`` or ``"InterfacesRemoved"``).
+
+    One dbus-python receiver per signal fans out to all handlers, so each
+    ObjectManager signal costs a single match-and-unpack in Python however
+    many services listen.  Handlers run on the GLib thread in registration
+    order; one raising does not keep the others from running.
+    """
+    with _OM_LOCK:
+        handlers = _OM_HANDLERS.get(signal_name)
+        if handlers is None:
+            get_bus().add_signal_receiver(
+                lambda path, interfaces: _fan_out(signal_name, path, interfaces),
+                dbus_interface=DBUS_OM_IFACE,
+                signal_name=signal_name,
+                bus_name=BLUEZ_SERVICE_NAME,
+                path=BLUEZ_OM_PATH,
+            )
+            handlers = []
+        _OM_HANDLERS[signal_name] = handlers + [handler]
+
+
+def _fan_out(signal_name: str, path, interfaces) -> None:
+    for handler in _OM_HANDLERS.get(signal_name, ()):
+        try:
+            handler(path, interfaces)
+        except Exception:  # noqa: BLE001
+            log.exception("%s handler %r failed", signal_name, handler)
+
+
+def _fast_bus() -> Optional["_FastBus"]:
+    """Return the shared dbus-fast connection, creating it on first use."""
+
+    global _FAST, _FAST_DISABLED
+
+    if _FAST_DISABLED:
+        return None
+
+    if _FAST is None:
+        with _FAST_LOCK:
+            if _FAST is None and not _FAST_DISABLED:
+                try:
+                    _FAST = _FastBus()
+                except ImportError:
+                    _FAST_DISABLED = True
+                    log.debug("dbus-fast not installed – using dbus-python for outgoing calls")
+                except Exception as exc:  # noqa: BLE001
+                    _FAST_DISABLED = True
+                    log.warning("dbus-fast unavailable (%s) – using dbus-python", exc)
+    return _FAST
+
+
+def get_managed_objects_fast() -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+    """Return the BlueZ object tree via dbus-fast, or ``None`` if unavailable.
+
+    The result has the same shape as dbus-python's ``GetManagedObjects()``
+    reply but with plain Python values.  Callers fall back to their own
+    dbus-python proxy whenever this returns ``None``.
+    """
+
+    fast = _fast_bus()
+    if fast is None:
+        return None
+    try:
+        return fast.get_managed_objects()
+    except Exception as exc:  # noqa: BLE001
+        log.warning("dbus-fast GetManagedObjects failed: %s", exc)
+        return None
+
+
+def call_methods_fast(
+    paths: Sequence[str], interface: str, member: str, timeout: float
+) -> Optional[List[Optional[Exception]]]:
+    """Call argument-less *interface.member* on every BlueZ object in *paths*.
+
+    All calls are in flight at once; each is cancelled after *timeout*
+    seconds.  Returns one entry per path – ``None`` on success, otherwise the
+    exception – or ``None`` overall when dbus-fast is unavailable, in which
+    case the caller should use its dbus-python fallback.
+    """
+
+    fast = _fast_bus()
+    if fast is None:
+        return None
+    try:
+        return fast.call_many(paths, interface, member, timeout)
+    except Exception as exc:  # noqa: BLE001
+        log.warning("dbus-fast %s.%s batch failed: %s", interface, member, exc)
+        return None
+
+
+class _FastBus:
+    """Private dbus-fast connection driven by its own asyncio loop thread."""
+
+    TIMEOUT_S = 5.0
+
+    def __init__(self):
+        from dbus_fast import BusType, Message, MessageType
+        from dbus_fast.aio import MessageBus
+
+        self._message = Message
+        self._error_type = MessageType.ERROR
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="dbus-fast", daemon=True).start()
+        try:
+            self._bus = self._run(MessageBus(bus_type=BusType.SYSTEM).connect())
+        except Exception:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise
+
+    def _run(self, coro, timeout: float = TIMEOUT_S):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _call(self, path: str, interface: str, member: str, timeout: float):
+        reply = await asyncio.wait_for(self._bus.call(self._message(
+            destination=BLUEZ_SERVICE_NAME,
+            path=path,
+            interface=interface,
+            member=member,
+        )), timeout)
+        if reply.message_type == self._error_type:
+            raise RuntimeError(f"{reply.error_name}: {reply.body}")
+        return reply
+
+    def call_many(self, paths, interface: str, member: str, timeout: float) -> List[Optional[Exception]]:
+        async def _gather():
+            return await asyncio.gather(
+                *(self._call(path, interface, member, timeout) for path in paths),
+                return_exceptions=True,
+            )
+        results = self._run(_gather(), timeout + 1.0)
+        return [r if isinstance(r, BaseException) else None for r in results]
+
+    def get_managed_objects(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        reply = self._run(self._call(BLUEZ_OM_PATH, DBUS_OM_IFACE, "GetManagedObjects", self.TIMEOUT_S))
+        # Unwrap the a{sv} Variants so callers can keep using plain .get()
+        return {
+            path: {
+                iface: {name: variant.value for name, variant in props.items()}
+                for iface, props in ifaces.items()
+            }
+            for path, ifaces in reply.body[0].items()
+        }
@@ -15,27 +15,29 @@ from __future__ import annotations
 
 import threading
 from enum import Enum, auto
-from queue import Queue, Empty
+from queue import Queue
 from typing import Dict, List, Tuple
 
-from syncsonic_ble.state_management.bus_manager import get_bus
+from syncsonic_ble.state_management.bus_manager import get_bus, subscribe_object_manager
 from syncsonic_ble.state_management.scan_manager import ScanManager
 from syncsonic_ble.state_change.action_planning import connect_one_plan  # rename of your existing file
 from syncsonic_ble.state_change.action_functions import (                      # thin wrappers around DBus ops
-    disconnect_device_dbus,
+    disconnect_devices_dbus,
     connect_device_dbus,
     pair_device_dbus,
     trust_device_dbus,
     remove_device_dbus,
 )
-from syncsonic_ble.helpers.pulseaudio_helpers import create_loopback, remove_loopback_for_device, setup_pulseaudio
+from syncsonic_ble.helpers.pulseaudio_helpers import create_loopback, remove_loopback_for_device, setup_pulseaudio, a2dp_sink_name
 from syncsonic_ble.utils.logging_conf import get_logger
 import subprocess, time
-from syncsonic_ble.utils.constants import (Msg, DBUS_PROP_IFACE, DBUS_OM_IFACE, DEVICE_INTERFACE, ADAPTER_INTERFACE, BLUEZ_SERVICE_NAME, A2DP_UUID)
+from syncsonic_ble.utils.constants import (Msg, DBUS_PROP_IFACE, DEVICE_INTERFACE, ADAPTER_INTERFACE, BLUEZ_SERVICE_NAME, A2DP_UUID, MEDIA_TRANSPORT_INTERFACE)
 from syncsonic_ble.infra.gatt_service import Characteristic
+from syncsonic_ble.state_change.action_request_handlers import invalidate_paired_cache, PAIRED_CACHE_PROPS
 from dbus import Interface
+from gi.repository import GLib
 from syncsonic_ble.state_management.device_manager import DeviceManager
-from syncsonic_ble.helpers.adapter_helpers import extract_mac, device_path_on_adapter
+from syncsonic_ble.helpers.adapter_helpers import extract_mac, device_path_on_adapter, get_managed_objects, forget_adapter_paths, mac_to_path_segment
 from syncsonic_ble.state_change.action_planning import analyze_device
 logger = get_logger(__name__)
 
@@ -48,11 +50,46 @@ class Intent(Enum):
     DISCONNECT   = auto()   # expects key: mac
     SET_EXPECTED = auto()   # expects key: list[str]
     LOOPBACK_SYNC = auto()  # expects key: {"mac": <str>, "connected": <bool>}
+    LOOPBACK_READY = auto() # PA thread result: {"mac": <str>, "ticket": <int>, "module_id": <int|None>, "notify": <bool>}
+    SET_LATENCY  = auto()   # expects keys: mac, latency (ms)
     TEST_LATENCY = auto()   # New: test latency of connected speakers
 
 
 work_q: Queue[Tuple[Intent, Dict]] = Queue()  # one global queue
 
+# Put on work_q (and the PA queue) by ConnectionService.stop() to end the
+# blocking worker loops.
+_SHUTDOWN = object()
+
+# Connected can flap True/False/True within a second while a speaker
+# reconnects; only the state that survives this window reaches the worker.
+LOOPBACK_SYNC_DEBOUNCE_MS = 250
+
+# mac → latest Connected value awaiting the debounce timer
+_sync_lock = threading.Lock()
+_sync_pending: Dict[str, bool] = {}
+
+
+def schedule_loopback_sync(mac: str, connected: bool) -> None:
+    """Post a LOOPBACK_SYNC for *mac* once LOOPBACK_SYNC_DEBOUNCE_MS passes.
+
+    Calls within the window collapse into one intent carrying the last
+    state.  Safe to call from any thread.
+    """
+    with _sync_lock:
+        scheduled = mac in _sync_pending
+        _sync_pending[mac] = connected
+    if not scheduled:
+        GLib.timeout_add(LOOPBACK_SYNC_DEBOUNCE_MS, _flush_loopback_sync, mac)
+
+
+def _flush_loopback_sync(mac: str) -> bool:
+    with _sync_lock:
+        connected = _sync_pending.pop(mac, None)
+    if connected is not None:
+        work_q.put((Intent.LOOPBACK_SYNC, {"mac": mac, "connected": connected}))
+    return False  # one-shot timer
+
 # ---------------------------------------------------------------------------
 # ConnectionService implementation
 # ---------------------------------------------------------------------------
@@ -66,15 +103,57 @@ class ConnectionService:
         self.bus  = get_bus()          # singleton, thread‑safe
         self.scan = ScanManager()      # owns discovery
 
+        # In-memory mirror of the BlueZ object tree.  Entries are replaced,
+        # never mutated in place, so a shallow copy is a consistent snapshot.
+        self._objects_lock = threading.Lock()
+        self._objects: Dict[str, Dict[str, Dict]] = {}
+        # MediaTransport1 object paths; _transport_cond (sharing the mirror
+        # lock) is notified whenever one appears
+        self._transports: set[str] = set()
+        self._transport_cond = threading.Condition(self._objects_lock)
+        # obj_path → upper-case MAC ("" for non-device paths); paths are
+        # immutable so entries only go away on InterfacesRemoved
+        self._path_mac_cache: Dict[str, str] = {}
+        # upper-case MAC → device paths BlueZ reports as Connected; guarded
+        # by _objects_lock and maintained alongside the mirror
+        self._connected_macs: Dict[str, set[str]] = {}
+        # device path → cached Device1 proxy (dropped on InterfacesRemoved)
+        self._dev_ifaces: Dict[str, Interface] = {}
+
         self.bus.add_signal_receiver(
             self._on_props_changed,
             dbus_interface="org.freedesktop.DBus.Properties",
             signal_name="PropertiesChanged",
-            path="/org/bluez",
+            bus_name=BLUEZ_SERVICE_NAME,
+            path_keyword="path",
         )
+        subscribe_object_manager("InterfacesAdded", self._on_interfaces_added)
+        subscribe_object_manager("InterfacesRemoved", self._on_interfaces_removed)
+        self._prime_objects()
 
         self.expected: set[str] = set()
-        self.loopbacks: set[str] = set()  # macs that already have loopbacks
+        self.loopbacks: dict[str, int] = {}  # mac → loopback module id
+        # mac → ticket of the latest creation queued on the PA thread; only
+        # the LOOPBACK_READY carrying that ticket is recorded
+        self._loopback_pending: Dict[str, int] = {}
+        self._loopback_ticket = 0
+
+        # PulseAudio work runs on its own thread so a slow pactl never
+        # stalls the BlueZ state machine; results come back via work_q.
+        self._pa_q: Queue[Tuple[str, str, object]] = Queue()
+        self._pa_worker_thread = threading.Thread(target=self._pa_worker, daemon=True)
+        self._pa_worker_thread.start()
+
+        # intent → handler; every Intent member must have an entry
+        self._dispatch = {
+            Intent.SET_EXPECTED:   self._on_set_expected,
+            Intent.CONNECT_ONE:    self._on_connect_one,
+            Intent.DISCONNECT:     self._on_disconnect,
+            Intent.LOOPBACK_SYNC:  self._on_loopback_sync,
+            Intent.LOOPBACK_READY: self._on_loopback_ready,
+            Intent.SET_LATENCY:    self._on_set_latency,
+            Intent.TEST_LATENCY:   self._on_test_latency,
+        }
 
         self._worker = threading.Thread(target=self._run_worker, daemon=True)
         self._worker.start()
@@ -89,6 +168,56 @@ class ConnectionService:
         """Called by *any* transport thread (Flask / BLE etc.)."""
         work_q.put((intent, payload))
 
+    def stop(self):
+        """Ask both worker threads to exit once their queues drain."""
+        work_q.put((_SHUTDOWN, None))
+        self._pa_q.put((_SHUTDOWN, "", None))
+
+    # -----------------------------
+    # PulseAudio executor (own thread)
+    # -----------------------------
+
+    def _request_loopback(self, mac: str, notify_failure: bool = False, latency_ms: int | None = None) -> None:
+        """Queue loopback creation for *mac* unless it exists or is pending.
+
+        An explicit *latency_ms* always queues a (re)creation, superseding
+        whatever is pending for that MAC.
+        """
+        if latency_ms is None and (mac in self.loopbacks or mac in self._loopback_pending):
+            return
+        self._loopback_ticket += 1
+        self._loopback_pending[mac] = self._loopback_ticket
+        self._pa_q.put(("create", mac, (self._loopback_ticket, notify_failure, latency_ms)))
+
+    def _release_loopback(self, mac: str) -> None:
+        """Queue loopback removal; also supersedes a pending creation."""
+        self._loopback_pending.pop(mac, None)
+        self._pa_q.put(("remove", mac, self.loopbacks.pop(mac, None)))
+
+    def _pa_worker(self):
+        while True:
+            op, mac, arg = self._pa_q.get()
+            if op is _SHUTDOWN:
+                break
+            if op == "create":
+                ticket, notify, latency_ms = arg
+                module_id = None
+                try:
+                    if latency_ms is None:
+                        module_id = create_loopback(a2dp_sink_name(mac))
+                    else:
+                        module_id = create_loopback(a2dp_sink_name(mac), latency_ms=latency_ms)
+                except Exception:
+                    logger.exception(f"Loopback creation for {mac} failed")
+                # always report back so the MAC leaves _loopback_pending
+                work_q.put((Intent.LOOPBACK_READY,
+                            {"mac": mac, "ticket": ticket, "module_id": module_id, "notify": notify}))
+            elif op == "remove":
+                try:
+                    remove_loopback_for_device(mac, module_id=arg)
+                except Exception:
+                    logger.exception(f"Loopback removal for {mac} failed")
+
     # ------------------------------------------------------------------
     #  BlueZ signal helpers
     #
@@ -96,161 +225,268 @@ class ConnectionService:
     #    BlueZ object path like "…/dev_AA_BB_CC_DD_EE_FF".
     #
     #  • _on_props_changed(...)   – runs in the GLib thread whenever
-    #    BlueZ fires PropertiesChanged.  If the signal toggles the
-    #    Connected flag for one of our *expected* speakers, we enqueue a
-    #    LOOPBACK_SYNC intent so the worker thread can create/remove the
-    #    loopback safely and in order.
+    #    BlueZ fires PropertiesChanged.  Keeps the object-tree mirror
+    #    current.  Connected transitions reach the worker as LOOPBACK_SYNC
+    #    via DeviceManager → schedule_loopback_sync(), which collapses
+    #    toggles within LOOPBACK_SYNC_DEBOUNCE_MS into one intent.
+    #
+    #  • _on_interfaces_added/removed(...) – keep the mirror in step
+    #    with objects BlueZ creates or tears down.
+    #
+    #  • _connected_macs – which MACs are Connected on which paths, so
+    #    a disconnect request can skip the tree walk entirely.
     # ------------------------------------------------------------------
 
     _extract_mac = staticmethod(extract_mac)
 
-    def _on_props_changed(self, sender, obj_path, iface, signal, params):
-        #logger.info(f"PROP signal {mac} Connected={connected}")
+    def _mac_for_path(self, obj_path: str) -> str:
+        mac = self._path_mac_cache.get(obj_path)
+        if mac is None:
+            mac = self._path_mac_cache.setdefault(obj_path, (self._extract_mac(obj_path) or "").upper())
+        return mac
 
-        # Params is a GLib Variant → unpack to tuple
-        changed_iface, changed_dict, _invalidated = params
+    def _track_connected(self, obj_path: str, connected: bool):
+        """Update _connected_macs; caller holds _objects_lock."""
+        mac = self._mac_for_path(obj_path)
+        if not mac:
+            return
+        paths = self._connected_macs.get(mac)
+        if connected:
+            self._connected_macs.setdefault(mac, set()).add(obj_path)
+        elif paths is not None:
+            paths.discard(obj_path)
+            if not paths:
+                del self._connected_macs[mac]
+
+    def _prime_objects(self):
+        """Seed the mirror with one GetManagedObjects() call."""
+        objects = get_managed_objects(self.bus)
+        with self._objects_lock:
+            self._objects = {
+                str(path): {str(iface): dict(props) for iface, props in ifaces.items()}
+                for path, ifaces in objects.items()
+            }
+            self._connected_macs = {}
+            self._transports = set()
+            for path, ifaces in self._objects.items():
+                if ifaces.get(DEVICE_INTERFACE, {}).get("Connected", False):
+                    self._track_connected(path, True)
+                if MEDIA_TRANSPORT_INTERFACE in ifaces:
+                    self._transports.add(path)
+
+    def _managed_objects(self) -> Dict[str, Dict[str, Dict]]:
+        """Snapshot of the BlueZ object tree (same shape as GetManagedObjects)."""
+        with self._objects_lock:
+            return dict(self._objects)
+
+    def _on_interfaces_added(self, path, interfaces):
+        path = str(path)
+        if ADAPTER_INTERFACE in interfaces:
+            forget_adapter_paths()
+        if DEVICE_INTERFACE in interfaces:
+            invalidate_paired_cache()
+        with self._objects_lock:
+            entry = dict(self._objects.get(path, {}))
+            entry.update({str(iface): dict(props) for iface, props in interfaces.items()})
+            self._objects[path] = entry
+            if DEVICE_INTERFACE in interfaces:
+                self._track_connected(path, bool(interfaces[DEVICE_INTERFACE].get("Connected", False)))
+            if MEDIA_TRANSPORT_INTERFACE in interfaces:
+                self._transports.add(path)
+                self._transport_cond.notify_all()
+
+    def _on_interfaces_removed(self, path, interfaces):
+        path = str(path)
+        if ADAPTER_INTERFACE in interfaces:
+            forget_adapter_paths()
+        with self._objects_lock:
+            if DEVICE_INTERFACE in interfaces:
+                self._track_connected(path, False)
+                self._path_mac_cache.pop(path, None)
+                self._dev_ifaces.pop(path, None)
+                invalidate_paired_cache()
+            if MEDIA_TRANSPORT_INTERFACE in interfaces:
+                self._transports.discard(path)
+            old = self._objects.get(path)
+            if old is None:
+                return
+            entry = {iface: props for iface, props in old.items() if iface not in interfaces}
+            if entry:
+                self._objects[path] = entry
+            else:
+                del self._objects[path]
+
+    def _on_props_changed(self, changed_iface, changed_dict, invalidated=None, path=None):
+        if not path or not path.startswith("/org/bluez/"):
+            return
+        obj_path = str(path)
+
+        with self._objects_lock:
+            old = self._objects.get(obj_path)
+            if old is not None and changed_iface in old:
+                props = dict(old[changed_iface])
+                props.update(changed_dict)
+                for name in invalidated or ():
+                    props.pop(name, None)
+                entry = dict(old)
+                entry[str(changed_iface)] = props
+                self._objects[obj_path] = entry
+            if changed_iface == DEVICE_INTERFACE and "Connected" in changed_dict:
+                self._track_connected(obj_path, bool(changed_dict["Connected"]))
 
         # We only care about Device1 property changes
         if changed_iface != "org.bluez.Device1":
             return
-
-        mac = self._extract_mac(obj_path)
-        if not mac or "Connected" not in changed_dict:
-            return
-        if mac.upper() not in self.expected:
-            return
-
-        connected = bool(changed_dict["Connected"])
-        work_q.put((
-            Intent.LOOPBACK_SYNC,
-            {"mac": mac.upper(), "connected": connected}
-        ))
+        if not PAIRED_CACHE_PROPS.isdisjoint(changed_dict) or invalidated:
+            invalidate_paired_cache()
 
 
     # -----------------------------
     # Worker loop (runs in its own thread)
     # -----------------------------
 
-    def _run_worker(self):  # noqa: C901 – complexity is okay for now
+    def _run_worker(self):
         while True:
-            try:
-                intent, payload = work_q.get(timeout=1)
-            except Empty:
-                continue
-            
-
-            if intent is Intent.SET_EXPECTED:
-                macs: List[str] = [m.upper() for m in payload["macs"]]
-                replace: bool = payload.get("replace", False)
-                if replace:
-                    self.expected = set(macs)
-                else:
-                    self.expected.update(macs)
-                logger.info(f"Expected set now {self.expected}")
+            intent, payload = work_q.get()
+            if intent is _SHUTDOWN:
+                break
+            self._dispatch[intent](payload)
 
-            elif intent is Intent.CONNECT_ONE:
-                mac   = payload["mac"].upper()
-                allow = [m.upper() for m in payload["allowed"]]
+    # -----------------------------
+    # Intent handlers (worker thread)
+    # -----------------------------
 
-                self.expected.add(mac)          # so loopback sync recognises it
+    def _on_set_expected(self, payload: Dict):
+        macs: List[str] = [m.upper() for m in payload["macs"]]
+        replace: bool = payload.get("replace", False)
+        if replace:
+            self.expected = set(macs)
+        else:
+            self.expected.update(macs)
+        logger.info(f"Expected set now {self.expected}")
 
+    def _on_connect_one(self, payload: Dict):
+        mac   = payload["mac"].upper()
+        allow = [m.upper() for m in payload["allowed"]]
 
+        self.expected.add(mac)          # so loopback sync recognises it
 
-                # # Re‑evaluate object tree each time
+        # Re‑evaluate the (signal-maintained) object tree each time
+        obj_mgr = self._managed_objects()
 
-                om = Interface(self.bus.get_object("org.bluez", "/"), DBUS_OM_IFACE)
-                obj_mgr = om.GetManagedObjects()
+        status, ctrl_mac, dc_list = connect_one_plan(mac, allow, obj_mgr)
 
-                status, ctrl_mac, dc_list = connect_one_plan(mac, allow, obj_mgr)
+        dc_targets = [(device_path_on_adapter(self.bus, adapter_mac, dev_mac), dev_mac)
+                      for dev_mac, adapter_mac in dc_list]
+        for (_, dev_mac), ok in zip(dc_targets, disconnect_devices_dbus(dc_targets, self.bus, drop_loopbacks=False)):
+            if ok:
+                self._release_loopback(dev_mac)
 
-                for dev_mac, adapter_mac in dc_list:
-                    path = device_path_on_adapter(self.bus, adapter_mac, dev_mac)
-                    disconnect_device_dbus(path, dev_mac, self.bus)
-                
-                if status == "already_connected":
-                    sink = f"bluez_sink.{mac.replace(':', '_')}.a2dp_sink"
-                    # use ctrl_mac (the HCI) and mac (the device) instead
-                    device_path = device_path_on_adapter(self.bus, ctrl_mac, mac)
-                    dev_obj = self.bus.get_object(BLUEZ_SERVICE_NAME, device_path)
-                    dev_iface = Interface(dev_obj, DEVICE_INTERFACE)
+        if status == "already_connected":
+            # use ctrl_mac (the HCI) and mac (the device) instead
+            try:
+                self._ensure_a2dp(ctrl_mac, mac)
+            except Exception as e:
+                logger.info(f"⚠️ ConnectProfile(A2DP) failed: {e}")
 
-                    logger.info(f"→ [DEBUG] Asking BlueZ to connect A2DP on {device_path}")
-                    try:
-                        dev_iface.ConnectProfile(A2DP_UUID)
-                        logger.info("→ [DEBUG] ConnectProfile(A2DP) succeeded")
-                    except Exception as e:
-                        logger.info(f"⚠️ ConnectProfile(A2DP) failed: {e}")
-                                    
+            # signal connect success
+            if self._char:
+                self._char.send_notification(
+                    Msg.CONNECTION_STATUS_UPDATE,
+                    {"phase": "connect_success", "device": mac}
+                )
 
-                     # signal connect success
-                    if self._char:
-                        self._char.send_notification(
-                            Msg.CONNECTION_STATUS_UPDATE,
-                            {"phase": "connect_success", "device": mac}
-                        )
+            self._request_loopback(mac)
+            # we're done; nothing else to do for this intent
+            return
 
-                    if mac not in self.loopbacks:
-                        if create_loopback(sink):
-                            self.loopbacks.add(mac)
-                            logger.info(f"✅ Loopback created for already-connected {mac}")
-                    # we're done; nothing else to do for this intent
-                    continue
-
-                if status == "needs_connection" and ctrl_mac:
-                    self._try_reconnect(ctrl_mac, mac)
-
-            elif intent is Intent.DISCONNECT:
-                mac = payload["mac"].upper()
-                self._disconnect_everywhere(mac)
-
-            elif intent is Intent.LOOPBACK_SYNC:
-                mac        = payload["mac"]
-                connected  = payload["connected"]
-                sink       = f"bluez_sink.{mac.replace(':', '_')}.a2dp_sink"
-
-                if connected and mac not in self.loopbacks:
-                    if create_loopback(sink):
-                        self.loopbacks.add(mac)
-                        logger.info(f"✅ Loopback autoprovisioned for {mac}")
-                elif not connected and mac in self.loopbacks:
-                    remove_loopback_for_device(mac)
-                    self.loopbacks.remove(mac)
-                    logger.info(f"🗑️  Loopback removed after disconnect for {mac}")
-
-            elif intent is Intent.TEST_LATENCY:
-                macs = payload["macs"]
-                logger.info(f"Starting latency test for {len(macs)} speakers")
-                
-                # Use existing PulseAudio controls through the service
-                for mac in macs:
-                    sink = f"bluez_sink.{mac.replace(':', '_')}.a2dp_sink"
-                    
-                    # Test each speaker
-                    logger.info(f"Testing speaker {mac}")
-                    
-                    # Use existing PulseAudio helpers
-                    # This will work because it's running in the service context
-                    subprocess.run(["pactl", "set-sink-volume", sink, "50%"])
-                    time.sleep(0.5)
-                    # Record timestamp
-                    timestamp = time.time()
-                    logger.info(f"Speaker {mac} timestamp: {timestamp}")
-                    time.sleep(1.5)
-                    
-                logger.info("Latency test complete")
+        if status == "needs_connection" and ctrl_mac:
+            self._try_reconnect(ctrl_mac, mac)
+
+    def _on_disconnect(self, payload: Dict):
+        mac = payload["mac"].upper()
+        self._disconnect_everywhere(mac)
+
+    def _on_loopback_sync(self, payload: Dict):
+        mac        = payload["mac"]
+        connected  = payload["connected"]
+
+        if connected:
+            self._request_loopback(mac)
+        elif mac in self.loopbacks or mac in self._loopback_pending:
+            self._release_loopback(mac)
+            logger.info(f"🗑️  Loopback removal queued after disconnect for {mac}")
+
+    def _on_loopback_ready(self, payload: Dict):
+        mac = payload["mac"]
+        if self._loopback_pending.get(mac) != payload["ticket"]:
+            return  # superseded by a removal or a newer creation
+        del self._loopback_pending[mac]
+        if payload["module_id"] is not None:
+            self.loopbacks[mac] = payload["module_id"]
+            logger.info(f"✅ Loopback established for {mac}")
+        else:
+            self.loopbacks.pop(mac, None)  # a re-creation may have unloaded it
+            logger.info(f"⚠️ Loopback creation failed for {mac}")
+            if payload["notify"] and self._char:
+                self._char.send_notification(
+                    Msg.ERROR,
+                    {"phase": "loopback creation failed, click connect again", "device": mac}
+                )
+
+    def _on_set_latency(self, payload: Dict):
+        mac = payload["mac"].upper()
+        logger.info(f"Re-creating loopback for {mac} with {payload['latency']} ms latency")
+        self._request_loopback(mac, notify_failure=True, latency_ms=int(payload["latency"]))
+
+    def _on_test_latency(self, payload: Dict):
+        macs = payload["macs"]
+        logger.info(f"Starting latency test for {len(macs)} speakers")
+
+        # Use existing PulseAudio controls through the service
+        for mac in macs:
+            sink = a2dp_sink_name(mac)
+
+            # Test each speaker
+            logger.info(f"Testing speaker {mac}")
+
+            # Use existing PulseAudio helpers
+            # This will work because it's running in the service context
+            subprocess.run(["pactl", "set-sink-volume", sink, "50%"])
+            time.sleep(0.5)
+            # Record timestamp
+            timestamp = time.time()
+            logger.info(f"Speaker {mac} timestamp: {timestamp}")
+            time.sleep(1.5)
+
+        logger.info("Latency test complete")
 
 
     # -----------------------------
     # Core helpers (same thread)
     # -----------------------------
 
+    def _device_iface(self, device_path: str) -> Interface:
+        """Device1 proxy for *device_path*, built (and introspected) once."""
+        iface = self._dev_ifaces.get(device_path)
+        if iface is None:
+            dev_obj = self.bus.get_object(BLUEZ_SERVICE_NAME, device_path)
+            iface = self._dev_ifaces[device_path] = Interface(dev_obj, DEVICE_INTERFACE)
+        return iface
+
+    def _ensure_a2dp(self, ctrl_mac: str, dev_mac: str):
+        """ConnectProfile(A2DP) for *dev_mac* on *ctrl_mac*; raises on failure."""
+        device_path = device_path_on_adapter(self.bus, ctrl_mac, dev_mac)
+        logger.info(f"→ [DEBUG] Asking BlueZ to connect A2DP on {device_path}")
+        self._device_iface(device_path).ConnectProfile(A2DP_UUID)
+        logger.info("→ [DEBUG] ConnectProfile(A2DP) succeeded")
+
     def _try_reconnect(self, adapter_mac: str, dev_mac: str):
         logger.info(f"FSM: reconnect {dev_mac} via {adapter_mac}")
 
         # NEW → ask the object tree what still needs doing
         state = analyze_device(self.bus, adapter_mac, dev_mac)
 
-        loopback_sink = f"bluez_sink.{dev_mac.replace(':', '_')}.a2dp_sink"
         device_path = device_path_on_adapter(self.bus, adapter_mac, dev_mac)
         max_retry = 3
         attempt   = 0
@@ -322,7 +558,7 @@ class ConnectionService:
                         )
                 else:
                     attempt += 1
-                    remove_device_dbus(device_path, self.bus)
+                    self._remove_device(device_path)
                     logger.info("    ⚠️ pairing failed, removed device and retrying")
                     state = "run_discovery"  # remove & retry
                     # signal pairing failure
@@ -351,16 +587,12 @@ class ConnectionService:
                     )
                 logger.info(f"entering the if connect loop")
                 if connect_device_dbus(device_path, self.bus):
-                    device_path = device_path_on_adapter(self.bus, adapter_mac, dev_mac)
-                    dev_obj = self.bus.get_object(BLUEZ_SERVICE_NAME, device_path)
-                    dev_iface = Interface(dev_obj, DEVICE_INTERFACE)
-
                     # wait for MediaTransport1 to appear
                     logger.info(f"→ Waiting for MediaTransport1 for {dev_mac} before ConnectProfile...")
                     if not self.wait_for_media_transport(dev_mac):
                         logger.warning(f"❌ MediaTransport1 never appeared for {dev_mac} after Device.Connect()")
                         attempt += 1
-                        remove_device_dbus(device_path, self.bus)
+                        self._remove_device(device_path)
                         state = "run_discovery"
                         continue  # retry
 
@@ -368,10 +600,8 @@ class ConnectionService:
                     time.sleep(1)
 
                     # Now attempt A2DP ConnectProfile
-                    logger.info(f"→ [DEBUG] Asking BlueZ to connect A2DP on {device_path}")
                     try:
-                        dev_iface.ConnectProfile(A2DP_UUID)
-                        logger.info("→ [DEBUG] ConnectProfile(A2DP) succeeded")
+                        self._ensure_a2dp(adapter_mac, dev_mac)
                     except Exception as e:
                         error_str = str(e)
                         if "InProgress" in error_str:
@@ -379,8 +609,7 @@ class ConnectionService:
                             # Wait a bit longer for the connection to complete
                             time.sleep(2)
                             try:
-                                dev_iface.ConnectProfile(A2DP_UUID)
-                                logger.info("→ [DEBUG] ConnectProfile(A2DP) succeeded on retry")
+                                self._ensure_a2dp(adapter_mac, dev_mac)
                             except Exception as e2:
                                 logger.error(f"❌ ConnectProfile failed on retry for {dev_mac}: {e2}")
                                 if self._char:
@@ -404,18 +633,10 @@ class ConnectionService:
                             Msg.CONNECTION_STATUS_UPDATE,
                             {"phase": "connect_success", "device": dev_mac}
                         )
-                    if create_loopback(loopback_sink):
-                        self.loopbacks.add(dev_mac)
-                        logger.info("    ✅ connected + loopback")
-                        return
-                    else:
-                        logger.info("    ⚠️ connected but loopback creation failed")
-                        if self._char:
-                            self._char.send_notification(
-                                Msg.ERROR,
-                                {"phase": "loopback creation failed, click connect again", "device": dev_mac}
-                            )
-                        return
+                    # Loopback is built on the PA thread; LOOPBACK_READY reports back
+                    self._request_loopback(dev_mac, notify_failure=True)
+                    logger.info("    ✅ connected, loopback queued")
+                    return
                     
                 if self._char:
                     self._char.send_notification(
@@ -423,44 +644,41 @@ class ConnectionService:
                         {"phase": "connect_failed", "device": dev_mac, "attempt": attempt}
                     )
                 logger.info(f"removing the device and retrying")
-                remove_device_dbus(device_path, self.bus)
+                self._remove_device(device_path)
                 state = "run_discovery"
                 attempt += 1
 
         logger.info(f"    ❌ failed to reconnect {dev_mac}")
 
+    def _remove_device(self, device_path: str) -> None:
+        """RemoveDevice, then forget the path so rediscovery really rescans."""
+        remove_device_dbus(device_path, self.bus)
+        self.scan.forget_device(device_path)
+
     def _disconnect_everywhere(self, mac: str):
-        om = Interface(self.bus.get_object("org.bluez", "/"), DBUS_OM_IFACE)
-        obj_mgr = om.GetManagedObjects()
-        for path, ifaces in obj_mgr.items():
-            dev = ifaces.get("org.bluez.Device1")
-            if dev and dev.get("Address", "").upper() == mac and dev.get("Connected", False):
-                disconnect_device_dbus(path, mac, self.bus)
-        if mac in self.loopbacks:
-            remove_loopback_for_device(mac)
-            self.loopbacks.remove(mac)
+        with self._objects_lock:
+            targets = [(path, mac) for path in self._connected_macs.get(mac, ())]
+        if not targets and mac not in self.loopbacks and mac not in self._loopback_pending:
+            return  # not connected anywhere – nothing to do
+        results = disconnect_devices_dbus(targets, self.bus, drop_loopbacks=False)
+        if any(results) or mac in self.loopbacks or mac in self._loopback_pending:
+            self._release_loopback(mac)
 
     
     # helper – ensure MediaTransport exists before we create loopback ------------
 
     def wait_for_media_transport(self, mac: str, timeout: int = 5) -> bool:
-        fmt = mac.replace(":", "_")
-        om_iface = Interface(self.bus.get_object(BLUEZ_SERVICE_NAME, "/"), DBUS_OM_IFACE)
+        fmt = mac_to_path_segment(mac)
         deadline = time.time() + timeout
 
-        while time.time() < deadline:
-            try:
-                objs = om_iface.GetManagedObjects()
-                if any(
-                    "org.bluez.MediaTransport1" in ifaces and fmt in path
-                    for path, ifaces in objs.items()
-                ):
-                    return True
-            except Exception as e:
-                logger.warning(f"[wait_for_media_transport] Error checking MediaTransport1 for {mac}: {e}")
-            time.sleep(0.5)
-
-        return False
+        # InterfacesAdded maintains _transports and wakes us – no polling
+        with self._transport_cond:
+            while not any(fmt in path for path in self._transports):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._transport_cond.wait(remaining)
+        return True
 
 
 
@@ -1,6 +1,9 @@
 """Tracks BlueZ Device objects, handles connect/disconnect, loopbacks."""
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import dbus
 from gi.repository import GLib
 from typing import Dict, Set
@@ -14,11 +17,28 @@ from syncsonic_ble.utils.constants import (
     Msg,
 )
 from syncsonic_ble.helpers.pulseaudio_helpers import create_loopback, remove_loopback_for_device
-from syncsonic_ble.helpers.adapter_helpers import extract_mac, connected_devices_on_adapter, adapter_prefix_from_path
+from syncsonic_ble.helpers.adapter_helpers import extract_mac, normalize_path, adapter_prefix_from_path, get_managed_objects, mac_to_path_segment
+from syncsonic_ble.state_management.bus_manager import subscribe_object_manager
 import re
 
 log = get_logger(__name__)
 
+# Placeholder names BlueZ derives from the address (e.g. "4C-87-5D-…")
+_MAC_NAME_RE = re.compile(r'([0-9A-F]{2}-){2,}', re.IGNORECASE)
+
+# Status pushes are coalesced to at most one BLE notification per window
+STATUS_PUSH_INTERVAL_MS = 100
+
+class _DevEntry:
+    __slots__ = ("obj", "iface", "mac", "alias", "connected")
+
+    def __init__(self, mac: str, obj=None, iface=None):
+        self.obj = obj            # proxies are None until the device is registered
+        self.iface = iface
+        self.mac: str = mac
+        self.alias: str = mac
+        self.connected: bool | None = None   # None until a Connected signal
+
 class DeviceManager:
     """Single source of truth for device state on one adapter."""
 
@@ -27,55 +47,122 @@ class DeviceManager:
         self.adapter_path: str   = adapter_path
 
         # runtime state ------------------------------------------------------
-        self.devices: Dict[str, Dict] = {}
+        self.devices: Dict[str, _DevEntry] = {}    # object path → entry
         self.reconnect_attempts: Dict[str, int] = {}
         self.max_reconnect_attempts: int = 3
         self.pairing_in_progress: Set[str] = set()
         self.connected: Set[str] = set()
+        self._connecting: Set[str] = set()      # connect work queued/running
+        self._lock = threading.RLock()          # guards connected/_connecting
+        # Blocking BlueZ calls for new connections run here, never on the
+        # GLib thread that dispatches D-Bus signals.
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="devmgr")
         self.expected: set[str] = set()
-        self._status: Dict[str, Dict] = {}
         self._char   = None            # will be injected later
-        self.scanning = False          # set to True when scanning for devices
+        self._push_pending = False     # a coalesced status push is scheduled
+        self._scanning = False         # see the ``scanning`` property
+        # mac → (name, paired) last streamed in the current scan session
+        self._seen_in_scan: Dict[str, tuple] = {}
+        # adapter prefix → MACs BlueZ reports Connected there; seeded once,
+        # then kept current by the Connected/InterfacesRemoved signals
+        self._adapter_connected: Dict[str, Set[str]] = {}
         self._setup_monitoring()
+        self._seed_adapter_connected()
 
     # ─────────────────────────── helpers ────────────────────────────────────
     _extract_mac = staticmethod(extract_mac)
 
+    def _entry_for(self, path: str, mac: str) -> _DevEntry:
+        entry = self.devices.get(path)
+        if entry is None:
+            entry = self.devices[path] = _DevEntry(mac)
+        return entry
+
+    def _proxies_for(self, path: str, mac: str) -> _DevEntry:
+        """Entry for *path* with its proxies built once per device lifetime."""
+        entry = self._entry_for(path, mac)
+        if entry.obj is None:
+            obj = self.bus.get_object(BLUEZ_SERVICE_NAME, path)
+            entry.iface = dbus.Interface(obj, DEVICE_INTERFACE)
+            entry.obj = obj  # set last: obj != None means the rest is ready
+        return entry
+
     def _devices_on_adapter(self, adapter_prefix: str) -> list[str]:
-        return connected_devices_on_adapter(self.bus, adapter_prefix)
+        return list(self._adapter_connected.get(adapter_prefix, ()))
+
+    def _seed_adapter_connected(self):
+        for path, ifaces in get_managed_objects(self.bus).items():
+            if ifaces.get(DEVICE_INTERFACE, {}).get("Connected", False):
+                self._note_connected(str(path), True)
+
+    def _note_connected(self, path: str, connected: bool):
+        norm = normalize_path(path)
+        if not norm:
+            return
+        mac, _, prefix = norm
+        if connected:
+            self._adapter_connected.setdefault(prefix, set()).add(mac)
+        else:
+            self._adapter_connected.get(prefix, set()).discard(mac)
 
     # ───────────────────────── public API ───────────────────────────────────
+    def stop(self):
+        """Drop queued connect work; a running job is not waited for."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
     def attach_characteristic(self, char):
         """Inject the Characteristic so we can push status updates."""
         self._char = char
 
+    @property
+    def scanning(self) -> bool:
+        """True while found devices are streamed to the phone."""
+        return self._scanning
+
+    @scanning.setter
+    def scanning(self, value: bool):
+        if value and not self._scanning:
+            self._seen_in_scan.clear()  # new session: report everything again
+        self._scanning = bool(value)
+
     # ────────────────────────── monitoring ─────────────────────────────────
     def _setup_monitoring(self):
-        self.bus.add_signal_receiver(
-            self._interfaces_added,
-            dbus_interface="org.freedesktop.DBus.ObjectManager",
-            signal_name="InterfacesAdded",
-        )
+        subscribe_object_manager("InterfacesAdded", self._interfaces_added)
+        subscribe_object_manager("InterfacesRemoved", self._interfaces_removed)
         self.bus.add_signal_receiver(
             self._properties_changed,
             dbus_interface="org.freedesktop.DBus.Properties",
             signal_name="PropertiesChanged",
+            bus_name=BLUEZ_SERVICE_NAME,
+            arg0=DEVICE_INTERFACE,            # daemon-side: Device1 changes only
             path_keyword="path",
         )
 
     # D‑Bus callbacks --------------------------------------------------------
     def _interfaces_added(self, path, interfaces):
         if DEVICE_INTERFACE in interfaces:
-            self._device_found(path)
+            self._device_found(path, interfaces[DEVICE_INTERFACE])
+
+    def _interfaces_removed(self, path, interfaces):
+        if DEVICE_INTERFACE in interfaces:
+            self._note_connected(str(path), False)
+            self.devices.pop(str(path), None)
 
     def _properties_changed(self, interface, changed, invalidated=None, path=None):
-        if interface != DEVICE_INTERFACE or "Connected" not in changed:
+        # Hot path: fires for every property change (RSSI during scans …)
+        if interface != DEVICE_INTERFACE:
             return
-
-        connected = bool(changed["Connected"])
+        connected = changed.get("Connected")
+        if connected is None:
+            return
+        connected = bool(connected)
         mac       = self._extract_mac(path)
         if not mac:
             return
+        entry = self.devices.get(str(path))
+        if entry is not None and entry.connected == connected:
+            return  # BlueZ re-emitted the state we already handled
+        self._note_connected(str(path), connected)
 
         log.info("[BlueZ] %s is now %s", mac,
                  "✓ CONNECTED" if connected else "✗ DISCONNECTED")
@@ -86,26 +173,52 @@ class DeviceManager:
             self._handle_disconnection(mac)
 
         # push status update -------------------------------------------------
-        alias = changed.get("Alias", mac)
-        self._status[mac] = {"alias": alias, "connected": connected}
+        entry = self._entry_for(str(path), mac)
+        entry.alias = changed.get("Alias", entry.alias)
+        entry.connected = connected
+        self._schedule_push()
+
+    def _schedule_push(self):
+        """Push the connected set once the current burst of signals settles."""
+        if self._push_pending or not self._char:
+            return
+        self._push_pending = True
+        GLib.timeout_add(STATUS_PUSH_INTERVAL_MS, self._flush_push)
+
+    def _flush_push(self) -> bool:
+        self._push_pending = False
         if self._char:
             self._char.push_status({"connected": list(self.connected)})
+        return False  # one-shot timer
 
     # ───────────────────────── connection helpers ───────────────────────────
     def _handle_new_connection(self, path: str, mac: str):
-        if mac in self.connected:
-            return  # duplicate signal
+        with self._lock:
+            if mac in self.connected or mac in self._connecting:
+                return  # duplicate signal
+            self._connecting.add(mac)
+        self._pool.submit(self._do_connect_work, str(path), mac)
 
-        dev_obj   = self.bus.get_object(BLUEZ_SERVICE_NAME, path)
-        dev_props = dbus.Interface(dev_obj, DBUS_PROP_IFACE)
+    def _do_connect_work(self, path: str, mac: str):
+        try:
+            self._connect_work(path, mac)
+        except Exception:  # noqa: BLE001 – pool would swallow it silently
+            log.exception("Connection handling failed for %s", mac)
+        finally:
+            with self._lock:
+                self._connecting.discard(mac)
+
+    def _connect_work(self, path: str, mac: str):
+        entry     = self._proxies_for(path, mac)
 
         
         # A2DP check ---------------------------------------------------------
         try:
-            uuids = dev_props.Get(DEVICE_INTERFACE, "UUIDs")
+            uuids = entry.obj.Get(DEVICE_INTERFACE, "UUIDs", dbus_interface=DBUS_PROP_IFACE)
         except Exception:
             uuids = []
-        if not any("110b" in u.lower() for u in uuids):
+        # BlueZ always reports full lower-case 128-bit UUIDs
+        if A2DP_UUID not in uuids:
             log.info("%s lacks A2DP – skipping", mac)
             return
 
@@ -113,9 +226,9 @@ class DeviceManager:
         others = [m for m in self._devices_on_adapter(adapter_prefix) if m != mac]
         if others:
             # another speaker already owns that controller
-            other_path = f"{adapter_prefix}/dev_{others[0].replace(':','_')}"
-            dbus.Interface(dev_obj, DEVICE_INTERFACE).Disconnect()
-            from syncsonic_ble.state_change.action_functions import remove_device_dbus
+            other_path = f"{adapter_prefix}/dev_{mac_to_path_segment(others[0])}"
+            from syncsonic_ble.state_change.action_functions import disconnect_devices_dbus, remove_device_dbus
+            disconnect_devices_dbus([(path, mac)], self.bus, drop_loopbacks=False)  # bounded timeout
             remove_device_dbus(other_path, self.bus)
             log.warning("%s tried adapter %s but %s is already there. Disconnecting and removing", mac, adapter_prefix, others[0])
             return
@@ -125,48 +238,55 @@ class DeviceManager:
         # _ensure_media_transport(self.bus, dev_obj, mac)
 
         # pass to the flow state management ---------------------------
-        self.connected.add(mac)
+        with self._lock:
+            if mac not in self._adapter_connected.get(adapter_prefix, ()):
+                log.info("%s disconnected before tracking completed", mac)
+                return
+            self.connected.add(mac)
+        GLib.idle_add(self._schedule_push)  # status snapshot now includes mac
         log.info("Tracking %s as connected — loopback deferred to FSM", mac)
-        from syncsonic_ble.state_management.connection_manager import Intent
-        from syncsonic_ble.state_management.connection_manager import work_q
-        work_q.put((Intent.LOOPBACK_SYNC, {"mac": mac, "connected": True}))
+        from syncsonic_ble.state_management.connection_manager import schedule_loopback_sync
+        schedule_loopback_sync(mac, True)
 
     def _handle_disconnection(self, mac: str):
-        if mac not in self.connected:
-            return
-        self.connected.remove(mac)
+        with self._lock:
+            if mac not in self.connected:
+                return
+            self.connected.remove(mac)
         log.info("Tracking %s as disconnected — loopback removal deferred to FSM", mac)
-        from syncsonic_ble.state_management.connection_manager import Intent
-        from syncsonic_ble.state_management.connection_manager import work_q
-        work_q.put((Intent.LOOPBACK_SYNC, {"mac": mac, "connected": False}))
+        from syncsonic_ble.state_management.connection_manager import schedule_loopback_sync
+        schedule_loopback_sync(mac, False)
 
     # ───────────────────────── misc helpers ─────────────────────────────────
-    def _device_found(self, path: str):
+    def _device_found(self, path: str, dev_props: Dict | None = None):
+        path = str(path)
         mac = self._extract_mac(path)
         if not mac:
             return
         # STREAMING SCAN MODE: broadcast each found device
         if self.scanning and self._char:
-            obj = self.bus.get_object(BLUEZ_SERVICE_NAME, path)
-            props = dbus.Interface(obj, DBUS_PROP_IFACE)
-            name = props.Get(DEVICE_INTERFACE, "Alias") or props.Get(DEVICE_INTERFACE, "Name")
-            paired = bool(props.Get(DEVICE_INTERFACE, "Paired"))
+            # InterfacesAdded already carries the Device1 properties
+            if dev_props is None:
+                dev_props = self._proxies_for(path, mac).obj.GetAll(
+                    DEVICE_INTERFACE, dbus_interface=DBUS_PROP_IFACE)
+            name = dev_props.get("Alias") or dev_props.get("Name")
+            paired = bool(dev_props.get("Paired", False))
+            if self._seen_in_scan.get(mac) == (name, paired):
+                return  # already streamed this session, nothing new
+            self._seen_in_scan[mac] = (name, paired)
             device_info = {"mac": mac, "name": name, "paired": paired}
             log.info("→ [SCAN STREAM] Discovered %s (%s), paired=%s", name, mac, paired)
     
-            if re.search(r'([0-9A-F]{2}-){2,}', name, re.IGNORECASE):
+            if _MAC_NAME_RE.search(name):
                 log.info(f"Filtering out device: {name}")
             else:
                 self._char.send_notification(Msg.SCAN_DEVICES, {"device": device_info})
                 log.info(f"Adding device: {mac} with name: {name}")
             return
         # NORMAL mode: only expected speakers
-        if mac.upper() not in self.connected:
+        if mac not in self.connected:  # extract_mac is already upper-case
             log.debug("Ignoring un-expected device %s (%s)", path, mac)
             return
-        obj = self.bus.get_object(BLUEZ_SERVICE_NAME, path)
-        props_iface = dbus.Interface(obj, DBUS_PROP_IFACE)
-        dev_iface   = dbus.Interface(obj, DEVICE_INTERFACE)
-        self.devices[path] = {"device": obj, "props": props_iface, "iface": dev_iface}
+        self._proxies_for(path, mac)
         log.info("Registered expected speaker %s at %s", mac, path)
 
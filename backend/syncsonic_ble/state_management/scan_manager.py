@@ -6,8 +6,8 @@ Thread‑safe owner of *all* Bluetooth discovery activity.
 *   **Exactly one** `StartDiscovery` / `StopDiscovery` call sequence per adapter.
 *   Reference count per adapter so multiple callers can share the same scan.
 *   Blocking `wait_for_device()` helper that any thread can call.
-*   No sleeps: uses `threading.Condition` to wait for BlueZ `InterfacesAdded`
-    signals.
+*   No sleeps: each waiter parks on its own `threading.Event`, set by the
+    BlueZ `InterfacesAdded` handler only when *its* device path appears.
 
 The class is transport‑agnostic: Flask, BLE, CLI – anyone can call
 `ensure_discovery()` + `wait_for_device()` from any thread.  All BlueZ work is
@@ -18,14 +18,15 @@ re‑entrant locks so parallel callers behave correctly.
 from __future__ import annotations
 
 import threading
-import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import dbus
 from syncsonic_ble.utils.logging_conf import get_logger
 from typing import Any
-import dbus
 
-from syncsonic_ble.state_management.bus_manager import get_bus
-from syncsonic_ble.helpers.adapter_helpers import adapter_proxies, device_path_on_adapter
+from syncsonic_ble.state_management.bus_manager import get_bus, subscribe_object_manager
+from syncsonic_ble.helpers.adapter_helpers import device_path_on_adapter, get_managed_objects
+from syncsonic_ble.utils.constants import ADAPTER_INTERFACE, BLUEZ_SERVICE_NAME, DEVICE_INTERFACE
 
 logger = get_logger(__name__)
 
@@ -62,17 +63,22 @@ class ScanManager:
     def __init__(self):
         self._bus = get_bus()
         self._adapters: Dict[str, _AdapterEntry] = {}   # mac → entry
-        self._lock = threading.RLock()                  # guards adapters & maps
-        self._cond = threading.Condition(self._lock)    # signalled on device add
-
-        # Subscribe once to BlueZ InterfacesAdded signals.
-        self._bus.add_signal_receiver(
-            self._on_interfaces_added,
-            dbus_interface="org.freedesktop.DBus.ObjectManager",
-            signal_name="InterfacesAdded",
-        )
-
-        # Build initial adapter map.
+        self._adapter_macs: Dict[str, str] = {}         # adapter path → mac
+        self._lock = threading.RLock()                  # serialises Start/StopDiscovery + refcounts
+        # Adapter add/remove arrives on the GLib thread, so the map has its
+        # own short-held lock that is never kept across a D-Bus call.
+        self._adapters_lock = threading.Lock()          # guards _adapters/_adapter_macs
+        # Device lookups use their own short-held lock so waiters and the
+        # InterfacesAdded handler never queue behind a discovery D-Bus call.
+        self._paths_lock = threading.Lock()
+        self._known_paths: set[str] = set()             # Device1 object paths
+        self._waiters: Dict[str, List[threading.Event]] = {}  # path → waiters
+
+        # Subscribe once to BlueZ InterfacesAdded/Removed signals, then seed
+        # the adapter map and device-path set with a single GetManagedObjects;
+        # from here on both are kept current by the signal handlers.
+        subscribe_object_manager("InterfacesAdded", self._on_interfaces_added)
+        subscribe_object_manager("InterfacesRemoved", self._on_interfaces_removed)
         self.refresh_adapters()
 
     # -----------------------------
@@ -83,7 +89,8 @@ class ScanManager:
         """Increment ref‑count; start discovery if it was previously idle."""
         adapter_mac = adapter_mac.upper()
         with self._lock:
-            entry = self._adapters.get(adapter_mac)
+            with self._adapters_lock:
+                entry = self._adapters.get(adapter_mac)
             if not entry:
                 raise ValueError(f"Adapter {adapter_mac} not found in BlueZ")
 
@@ -99,7 +106,8 @@ class ScanManager:
         """Decrement ref‑count; stop discovery when it reaches 0."""
         adapter_mac = adapter_mac.upper()
         with self._lock:
-            entry = self._adapters.get(adapter_mac)
+            with self._adapters_lock:
+                entry = self._adapters.get(adapter_mac)
             if not entry:
                 return
             if entry.refcount == 0:
@@ -125,53 +133,100 @@ class ScanManager:
         """
         adapter_mac = adapter_mac.upper()
         target_mac = target_mac.upper()
-        deadline = time.time() + timeout_s
-
-        with self._cond:
-            # Fast‑path: maybe it is already in the object tree
-            path = self._lookup_device_path(adapter_mac, target_mac)
-            if path:
-                return path
-
-            # Wait until InterfacesAdded arrives or timeout.
-            while time.time() < deadline:
-                remaining = deadline - time.time()
-                self._cond.wait(timeout=remaining)
-                path = self._lookup_device_path(adapter_mac, target_mac)
-                if path:
-                    return path
+        expected = device_path_on_adapter(self._bus, adapter_mac, target_mac)
+        if not expected:
+            logger.warning("[ScanMgr] adapter %s unknown – cannot wait for %s", adapter_mac, target_mac)
+            return None
+
+        # Fast‑path: maybe it is already in the object tree (a set lookup is
+        # atomic, so no lock is needed just to read)
+        if expected in self._known_paths:
+            return expected
+
+        event = threading.Event()
+        with self._paths_lock:
+            if expected in self._known_paths:  # appeared since the check above
+                return expected
+            self._waiters.setdefault(expected, []).append(event)
+
+        # Only InterfacesAdded for *this* path sets the event.
+        found = event.wait(timeout_s)
+        with self._paths_lock:
+            waiters = self._waiters.get(expected)
+            if waiters and event in waiters:
+                waiters.remove(event)
+                if not waiters:
+                    del self._waiters[expected]
+            if found or expected in self._known_paths:
+                return expected
         return None
 
+    def forget_device(self, device_path: str) -> None:
+        """Drop *device_path* right after a RemoveDevice call.
+
+        BlueZ replies to RemoveDevice before InterfacesRemoved reaches the
+        GLib thread; without this a following ``wait_for_device`` could
+        return the just-removed path and skip discovery.
+        """
+        with self._paths_lock:
+            self._known_paths.discard(str(device_path))
+
     # -----------------------------
     # BlueZ signal handler
     # -----------------------------
 
-    def _on_interfaces_added(self, sender, object_path, *args, **kwargs):  # noqa: D401,E501  # pragma: no cover
-        # We don't care about the details; just wake up waiters.
-        with self._cond:
-            self._cond.notify_all()
+    def _on_interfaces_added(self, object_path, interfaces):  # pragma: no cover
+        if DEVICE_INTERFACE in interfaces:
+            object_path = str(object_path)
+            with self._paths_lock:
+                self._known_paths.add(object_path)
+                waiters = self._waiters.pop(object_path, ())
+            for event in waiters:
+                event.set()
+        elif ADAPTER_INTERFACE in interfaces:
+            self._add_adapter(str(object_path), interfaces[ADAPTER_INTERFACE])
+
+    def _on_interfaces_removed(self, object_path, interfaces):  # pragma: no cover
+        if DEVICE_INTERFACE in interfaces:
+            with self._paths_lock:
+                self._known_paths.discard(str(object_path))
+        elif ADAPTER_INTERFACE in interfaces:
+            with self._adapters_lock:
+                mac = self._adapter_macs.pop(str(object_path), None)
+                if mac:
+                    self._adapters.pop(mac, None)
+            if mac:
+                logger.info("Adapter %s removed", mac)
 
     # -----------------------------
     # Internal helpers
     # -----------------------------
 
-    def _lookup_device_path(self, adapter_mac: str, dev_mac: str) -> Optional[str]:
-        """Return device object path if it exists under *adapter_mac*."""
-        om = dbus.Interface(self._bus.get_object("org.bluez", "/"), "org.freedesktop.DBus.ObjectManager")
-        objects = om.GetManagedObjects()
-        expected = device_path_on_adapter(self._bus, adapter_mac, dev_mac)
-        if expected and expected in objects:
-            return expected
-        return None
-
     def refresh_adapters(self) -> None:
-        """Rebuild the internal adapter map from the current BlueZ object tree.
+        """Rebuild the adapter map and device-path set from the BlueZ object tree.
 
-        Call this after USB-reset scripts or whenever adapters may have been
-        added/removed.  Thread-safe – it acquires the internal lock so callers
-        can invoke it from any thread.
+        Only needed once at start-up: afterwards Adapter1/Device1
+        InterfacesAdded/Removed signals keep both current, so USB resets no
+        longer require a manual refresh.  Thread-safe.
         """
-        with self._lock:
+        objects = get_managed_objects(self._bus)
+        with self._adapters_lock:
             self._adapters.clear()
-            for mac, proxy in adapter_proxies(self._bus).items():
-                self._adapters[mac] = _AdapterEntry(proxy)
\ No newline at end of file
+            self._adapter_macs.clear()
+        for path, ifaces in objects.items():
+            if ADAPTER_INTERFACE in ifaces:
+                self._add_adapter(str(path), ifaces[ADAPTER_INTERFACE])
+        known = [str(path) for path, ifaces in objects.items() if DEVICE_INTERFACE in ifaces]
+        with self._paths_lock:
+            self._known_paths.update(known)
+
+    def _add_adapter(self, path: str, props) -> None:
+        """Register the Adapter1 at *path* unless its MAC is already known."""
+        mac = str(props.get("Address", "")).upper()
+        if not mac:
+            return
+        proxy = dbus.Interface(self._bus.get_object(BLUEZ_SERVICE_NAME, path), ADAPTER_INTERFACE)
+        with self._adapters_lock:
+            if mac not in self._adapters:
+                self._adapters[mac] = _AdapterEntry(proxy)
+                self._adapter_macs[path] = mac
\ No newline at end of file
@@ -2,19 +2,24 @@
 from enum import IntEnum
 import os
 
-# Getting reserved vaiable
-reserved = os.getenv("RESERVED_HCI")
-if not reserved:
-    raise RuntimeError("RESERVED_HCI not set – cannot pick phone adapter")
+# Reserved (phone-advertising) controller, checked on first use -------------
+def require_reserved_hci() -> str:
+    """Return ``$RESERVED_HCI`` (e.g. ``hci1``) or raise if it is not set."""
+    reserved = os.getenv("RESERVED_HCI")
+    if not reserved:
+        raise RuntimeError("RESERVED_HCI not set – cannot pick phone adapter")
+    return reserved
 
 # D-Bus names / interfaces ---------------------------------------------------
 BLUEZ_SERVICE_NAME           = "org.bluez"
 DBUS_OM_IFACE                = "org.freedesktop.DBus.ObjectManager"
+BLUEZ_OM_PATH                = "/"   # BlueZ exports its ObjectManager at the root
 DBUS_PROP_IFACE              = "org.freedesktop.DBus.Properties"
 
 # Core adapter/device interfaces
 ADAPTER_INTERFACE            = "org.bluez.Adapter1"
 DEVICE_INTERFACE             = "org.bluez.Device1"
+MEDIA_TRANSPORT_INTERFACE    = "org.bluez.MediaTransport1"
 
 # GATT registration & runtime interfaces
 GATT_MANAGER_IFACE           = "org.bluez.GattManager1"
@@ -1,9 +1,11 @@
 """Central logging setup so *every* module shares the same formatter."""
-import logging, sys
+import logging, os, sys
 
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Override with e.g. LOG_LEVEL=DEBUG; unknown names fall back to INFO
+LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format=LOG_FORMAT,
     handlers=[logging.StreamHandler(sys.stdout)],
 )